@@ -4,7 +4,8 @@ All-in-one script: Enroll → Encode → Train
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
-from project.utils import Conf
+from project.utils import Conf, build_ann_index, export_model, build_thumbnail, encode_dataset, METRICS, write_textfile, textfile_path
+from project.utils import crop_face, load_face_boxes, save_face_boxes
 from tinydb import TinyDB, where
 import face_recognition
 import cv2
@@ -13,8 +14,6 @@ import platform
 import time
 import threading
 import pickle
-import numpy as np
-from imutils import paths
 from sklearn.preprocessing import LabelEncoder
 from sklearn.svm import SVC
 
@@ -92,6 +91,8 @@ def enroll_employee(employee_id, employee_name, progress_callback, status_callba
         # Create directory for storing face images
         employee_path = os.path.join(conf["dataset_path"], conf["class"], employee_id)
         os.makedirs(employee_path, exist_ok=True)
+        # Where the face is in each saved crop, so encoding can skip detection
+        face_boxes = load_face_boxes(employee_path)
         
         total_saved = 0
         status_callback(f"Step 1/3: Capturing faces (0/{conf['face_count']})")
@@ -100,31 +101,31 @@ def enroll_employee(employee_id, employee_name, progress_callback, status_callba
             if stop_event.is_set():
                 vs.release()
                 cv2.destroyAllWindows()
+                save_face_boxes(employee_path, face_boxes)
                 return False, "Enrollment cancelled by user"
             
-            ret, frame = vs.read()
+            with METRICS.timer("capture"):
+                ret, frame = vs.read()
             if not ret:
                 break
             
             frame = cv2.flip(frame, 1)
             rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            boxes = face_recognition.face_locations(rgb_frame, model=conf["detection_method"])
+            with METRICS.timer("detect"):
+                boxes = face_recognition.face_locations(rgb_frame, model=conf["detection_method"])
             frame_copy = frame.copy()
             
             # Draw boxes and save face images
             for (top, right, bottom, left) in boxes:
                 cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 2)
                 
-                padding = 70
-                top = max(0, top - padding)
-                bottom = min(frame.shape[0], bottom + padding)
-                left = max(0, left - padding)
-                right = min(frame.shape[1], right + padding)
-                face_image = frame_copy[top:bottom, left:right]
+                face_image, face_box = crop_face(frame_copy, (top, right, bottom, left))
                 
                 if total_saved < conf["face_count"]:
-                    save_path = os.path.join(employee_path, f"{str(total_saved).zfill(5)}.png")
-                    cv2.imwrite(save_path, face_image)
+                    file_name = f"{str(total_saved).zfill(5)}.png"
+                    with METRICS.timer("save_image"):
+                        cv2.imwrite(os.path.join(employee_path, file_name), face_image)
+                    face_boxes[file_name] = face_box
                     total_saved += 1
                     progress = int((total_saved / conf["face_count"]) * 33)  # 33% of total
                     progress_callback(progress)
@@ -138,6 +139,10 @@ def enroll_employee(employee_id, employee_name, progress_callback, status_callba
         
         vs.release()
         cv2.destroyAllWindows()
+        save_face_boxes(employee_path, face_boxes)
+        
+        # Notification photo for the kiosk
+        build_thumbnail(conf, employee_id)
         
         # Add employee to database
         student_table.insert({employee_id: [employee_name, "enrolled"]})
@@ -155,48 +160,24 @@ def encode_faces(progress_callback, status_callback):
         status_callback("Step 2/3: Generating face encodings...")
         progress_callback(33)
         
-        dataset_path = os.path.join(conf["dataset_path"], conf["class"])
         encodings_path = conf["encodings_path"]
         
-        # Grab image paths
-        imagePaths = list(paths.list_images(dataset_path))
-        total_images = len(imagePaths)
+        # Only new or changed images are encoded (33% to 66%); the rest come from the cache
+        def progress(done, total):
+            progress_callback(33 + int(done / total * 33))
+            status_callback(f"Step 2/3: Encoding images ({done}/{total})")
+        
+        data, summary = encode_dataset(conf, progress)
+        total_images = summary["images"]
         
         if total_images == 0:
             return False, "No images found in dataset"
         
-        knownEncodings = []
-        knownNames = []
-        
-        for (i, imagePath) in enumerate(imagePaths):
-            # Extract the person name
-            name = imagePath.split(os.path.sep)[-2]
-            
-            # Load and process the image
-            image = cv2.imread(imagePath)
-            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            # Convert to grayscale and expand dimensions
-            gray_image = cv2.cvtColor(rgb, cv2.COLOR_BGR2GRAY)
-            gray_img = np.expand_dims(gray_image, axis=2).repeat(3, axis=2)
-            encodings = face_recognition.face_encodings(gray_img)
-            
-            # Save encodings and names
-            for encoding in encodings:
-                knownEncodings.append(encoding)
-                knownNames.append(name)
-            
-            # Update progress (33% to 66%)
-            progress = 33 + int((i + 1) / total_images * 33)
-            progress_callback(progress)
-            status_callback(f"Step 2/3: Encoding images ({i + 1}/{total_images})")
-        
         # Serialize encodings
-        data = {"encodings": knownEncodings, "names": knownNames}
         with open(encodings_path, "wb") as f:
             pickle.dump(data, f)
         
-        status_callback(f"Step 2/3: ✓ Encoded {total_images} images")
+        status_callback(f"Step 2/3: ✓ Encoded {summary['encoded']} new images ({total_images} total)")
         time.sleep(1)
         
         return True, f"Encoded {total_images} images successfully"
@@ -243,6 +224,12 @@ def train_model(progress_callback, status_callback):
         with open(le_path, "wb") as f:
             pickle.dump(le, f)
         
+        # Build the approximate nearest-neighbour index next to the recognizer
+        build_ann_index(conf, data["encodings"], data["names"])
+
+        # Export the compact model the kiosk loads without sklearn
+        export_model(conf, recognizer, le, data["encodings"], data["names"])
+        
         progress_callback(100)
         status_callback("Step 3/3: ✓ Model training completed")
         time.sleep(1)
@@ -282,6 +269,13 @@ def automated_enrollment_process(employee_id, employee_name, progress_callback,
     finally:
         if db:
             db.close()
+        # Stage timings of this enrollment for the fleet's Prometheus scrape
+        if conf is not None and conf["metrics_textfile"]:
+            try:
+                write_textfile(textfile_path(conf["metrics_textfile"], "auto_enroll"))
+            except OSError as e:
+                print(f"[WARNING] Could not write metrics: {e}")
+        print(f"[INFO] {METRICS.overlay_text()}")
 
 # ===== GUI Code =====
 
@@ -0,0 +1,71 @@
+"""
+ANN Index Benchmark
+Reports recall@1 and query latency of the IVF (and IVF+PQ) index against
+exact nearest-neighbour search on a synthetic gallery
+"""
+import argparse
+import time
+import numpy as np
+from project.utils import IVFIndex, NearestNeighbourMatcher
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("-i", "--identities", type=int, default=10000,
+    help="number of identities in the gallery")
+ap.add_argument("-p", "--per-identity", type=int, default=30,
+    help="encodings per identity (face_count in config.json)")
+ap.add_argument("-q", "--queries", type=int, default=500,
+    help="number of query faces")
+ap.add_argument("-n", "--nprobe", type=int, nargs="+", default=[1, 4, 8, 16],
+    help="cells scanned per query")
+ap.add_argument("--pq", type=int, nargs="*", default=[0, 16],
+    help="product-quantization sub-vectors to try (0 = full encodings)")
+args = vars(ap.parse_args())
+
+rng = np.random.default_rng(42)
+
+# Identity centres spread like dlib encodings, samples jittered around them
+centres = rng.normal(0, 0.09, (args["identities"], 128)).astype(np.float32)
+encodings = np.repeat(centres, args["per_identity"], axis=0)
+encodings += rng.normal(0, 0.025, encodings.shape).astype(np.float32)
+names = np.repeat([str(i) for i in range(args["identities"])], args["per_identity"])
+
+truth = rng.integers(0, args["identities"], args["queries"])
+queries = centres[truth] + rng.normal(0, 0.025, (args["queries"], 128)).astype(np.float32)
+
+print(f"[INFO] gallery: {len(encodings)} encodings, {args['identities']} identities")
+
+def per_query_ms(search):
+    """Mean and p95 latency of single-face queries, in milliseconds"""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query[np.newaxis, :])
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.mean(samples), np.percentile(samples, 95)
+
+exact = NearestNeighbourMatcher(encodings, names)
+exact_idx, _ = exact.search(queries, k=1)
+exact_idx = exact_idx[:, 0]
+mean_ms, p95_ms = per_query_ms(lambda q: exact.search(q, k=1))
+
+print(f"\n{'Index':<16} {'nprobe':<8} {'Build (s)':<11} {'MB':<9} {'Recall@1':<10} {'ID recall':<11} {'Mean (ms)':<11} {'p95 (ms)':<10}")
+print("-" * 90)
+print(f"{'exact':<16} {'-':<8} {'-':<11} {exact.gallery.nbytes / 1e6:<9.1f} {1.0:<10.3f} {1.0:<11.3f} {mean_ms:<11.3f} {p95_ms:<10.3f}")
+
+for pq in args["pq"]:
+    start = time.perf_counter()
+    index = IVFIndex.build(encodings, names, pq_subvectors=pq)
+    build_time = time.perf_counter() - start
+    size = (index.vectors.nbytes if index.vectors is not None else index.pq_codes.nbytes) / 1e6
+    label = f"ivf{index.n_lists}" + (f"+pq{pq}" if pq else "")
+
+    for nprobe in args["nprobe"]:
+        ann_idx, _ = index.search(queries, k=1, nprobe=nprobe)
+        ann_idx = ann_idx[:, 0]
+        recall = np.mean(ann_idx == exact_idx)
+
+        # Same person as the exact answer, even if a different sample of them
+        id_recall = np.mean((ann_idx >= 0) & (exact.labels[np.maximum(ann_idx, 0)] == exact.labels[exact_idx]))
+        mean_ms, p95_ms = per_query_ms(lambda q: index.search(q, k=1, nprobe=nprobe))
+        print(f"{label:<16} {nprobe:<8} {build_time:<11.2f} {size:<9.1f} {recall:<10.3f} {id_recall:<11.3f} {mean_ms:<11.3f} {p95_ms:<10.3f}")
@@ -0,0 +1,136 @@
+"""
+SQLite Contention Benchmark
+Measures kiosk write latency (one UPSERT + commit per check-out) while report
+threads hammer the attendance table, with the old setup (rollback journal,
+fresh connection per report) and the shared WAL setup (tuned pragmas, pooled
+read-only connections)
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+import numpy as np
+from project.utils.attendance import CHECKOUT_SQL
+from project.utils.database import connect, ensure_schema, ReadPool, SCHEMA
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("-e", "--employees", type=int, default=500,
+    help="employees in the synthetic attendance table")
+ap.add_argument("-d", "--days", type=int, default=365,
+    help="days of history in the synthetic attendance table")
+ap.add_argument("-r", "--readers", type=int, default=4,
+    help="concurrent report threads")
+ap.add_argument("-s", "--seconds", type=float, default=10.0,
+    help="duration of each phase")
+ap.add_argument("--write-rate", type=float, default=20.0,
+    help="kiosk writes per second")
+args = vars(ap.parse_args())
+
+# The heaviest report in view_attendance.py: per-employee summary over a range
+REPORT_SQL = '''
+    SELECT employee_id, employee_name, COUNT(*) AS days_present,
+           SUM(working_hours) AS total_hours, AVG(working_hours) AS avg_hours
+    FROM attendance
+    WHERE date BETWEEN ? AND ?
+    GROUP BY employee_id, employee_name
+    ORDER BY employee_id
+'''
+
+def populate(db_path, wal):
+    """Synthetic history: every employee present every day"""
+    if wal:
+        ensure_schema(db_path)
+        conn = connect(db_path)
+    else:
+        conn = sqlite3.connect(db_path)
+        for statement in SCHEMA:
+            conn.execute(statement)
+    start = date.today() - timedelta(days=args["days"])
+    rows = []
+    for d in range(args["days"]):
+        day = (start + timedelta(days=d)).strftime("%Y-%m-%d")
+        for e in range(args["employees"]):
+            rows.append((str(e), f"Employee {e}", day, f"{day} 09:00:00", f"{day} 17:30:00", 8.5))
+    with conn:
+        conn.executemany('''
+            INSERT OR IGNORE INTO attendance (employee_id, employee_name, date, check_in, check_out, working_hours)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+    conn.close()
+
+def run_phase(db_path, wal, readers):
+    """Kiosk writes at write_rate while readers run reports; returns write latencies and report count"""
+    stop = threading.Event()
+    reports = [0]
+    pool = ReadPool(db_path, size=readers) if wal and readers else None
+    end = date.today().strftime("%Y-%m-%d")
+    begin = (date.today() - timedelta(days=30)).strftime("%Y-%m-%d")
+
+    def reader():
+        while not stop.is_set():
+            if pool is not None:
+                conn = pool.acquire()
+            else:
+                conn = sqlite3.connect(db_path)  # connect_db() opened one per report
+            try:
+                conn.execute(REPORT_SQL, (begin, end)).fetchall()
+                reports[0] += 1
+            except sqlite3.OperationalError:
+                pass  # "database is locked": the report failed
+            finally:
+                conn.close()
+
+    threads = [threading.Thread(target=reader, daemon=True) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+
+    writer = connect(db_path) if wal else sqlite3.connect(db_path)
+    today = date.today().strftime("%Y-%m-%d")
+    latencies = []
+    failures = 0
+    interval = 1.0 / args["write_rate"]
+    deadline = time.time() + args["seconds"]
+    while time.time() < deadline:
+        e = random.randrange(args["employees"])
+        params = (str(e), f"Employee {e}", today, f"{today} 09:00:00", time.strftime("%Y-%m-%d %H:%M:%S"), 8.0)
+        start = time.perf_counter()
+        try:
+            with writer:
+                writer.execute(CHECKOUT_SQL, params)
+            latencies.append(time.perf_counter() - start)
+        except sqlite3.OperationalError:
+            failures += 1
+        time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    if pool is not None:
+        pool.close()
+    return np.array(latencies) * 1000, reports[0], failures
+
+workdir = tempfile.mkdtemp(prefix="benchmark_database_")
+try:
+    print(f"[INFO] {args['employees']} employees x {args['days']} days, "
+          f"{args['readers']} report threads, {args['write_rate']:.0f} writes/s")
+    print(f"\n{'Setup':<10} {'Readers':<9} {'Writes':<8} {'Failed':<8} {'p50 (ms)':<10} {'p95 (ms)':<10} "
+          f"{'p99 (ms)':<10} {'Max (ms)':<10} {'Reports/s':<10}")
+    print("-" * 90)
+    for setup, wal in (("legacy", False), ("wal", True)):
+        db_path = os.path.join(workdir, f"{setup}.db")
+        populate(db_path, wal)
+        for readers in (0, args["readers"]):
+            latencies, reports, failures = run_phase(db_path, wal, readers)
+            print(f"{setup:<10} {readers:<9} {len(latencies):<8} {failures:<8} "
+                  f"{np.percentile(latencies, 50):<10.2f} {np.percentile(latencies, 95):<10.2f} "
+                  f"{np.percentile(latencies, 99):<10.2f} {latencies.max():<10.2f} "
+                  f"{reports / args['seconds']:<10.1f}")
+finally:
+    shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,67 @@
+"""
+Encoding Throughput Benchmark
+Encodes the same dataset images with 1, 2, 4 and 8 worker processes (the
+encode path used by enrollment and training, without the encoding cache) and
+reports images per second and the speedup over a measured one-worker run
+(always made first, even when 1 is not listed); --detect compares
+against running face detection on every crop. Times include starting the pool
+and loading dlib's models in every worker, as a real enrollment would.
+"""
+import argparse
+import json
+import os
+import time
+from project.utils import Conf, encode_files, list_images, face_boxes_for
+
+# Spawned workers import this module again, so everything runs under the guard
+if __name__ == "__main__":
+    # construct the argument parser and parse the arguments
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-c", "--conf", default="config/config.json",
+        help="path to the input configuration file")
+    ap.add_argument("-d", "--dataset", default=None,
+        help="image folder (default: dataset_path/class from the config)")
+    ap.add_argument("-w", "--workers", default="1,2,4,8",
+        help="comma-separated worker counts to compare")
+    ap.add_argument("-n", "--limit", type=int, default=240,
+        help="images to encode per run (the dataset is cycled if it has fewer)")
+    ap.add_argument("--detect", action="store_true",
+        help="ignore the face boxes recorded at enrollment and run face detection on every image")
+    ap.add_argument("-o", "--output", default="output/benchmark_encoding.json",
+        help="where to write the results as JSON")
+    args = vars(ap.parse_args())
+
+    conf = Conf(args["conf"])
+    dataset = args["dataset"] or os.path.join(conf["dataset_path"], conf["class"])
+    images = list_images(dataset)
+    if not images:
+        raise SystemExit(f"[ERROR] No images found in {dataset}")
+    images = [images[i % len(images)] for i in range(args["limit"])]
+    boxes = [None] * len(images) if args["detect"] else face_boxes_for(images)
+    known = sum(box is not None for box in boxes)
+    print(f"[INFO] {len(images)} images from {dataset}, {os.cpu_count()} cores, "
+          f"{known} with a recorded face box ({len(images) - known} need detection)")
+
+    print(f"\n{'Workers':<9} {'Seconds':<9} {'Images/s':<10} {'Speedup':<9} {'Efficiency':<10}")
+    print("-" * 50)
+    results = []
+    baseline = None
+    # The speedups are only meaningful against a real single-worker run
+    counts = sorted({1} | {int(w) for w in args["workers"].split(",")})
+    for workers in counts:
+        start = time.perf_counter()
+        encodings = encode_files(images, workers, boxes=boxes)
+        seconds = time.perf_counter() - start
+        if workers == 1:
+            baseline = seconds
+        speedup = baseline / seconds
+        results.append({"workers": workers, "seconds": seconds, "images_per_second": len(images) / seconds,
+                        "speedup": speedup, "faces": sum(len(e) for e in encodings)})
+        print(f"{workers:<9} {seconds:<9.2f} {len(images) / seconds:<10.1f} {speedup:<9.2f} "
+              f"{f'{speedup / workers * 100:.0f}%':<10}")
+
+    os.makedirs(os.path.dirname(args["output"]) or ".", exist_ok=True)
+    with open(args["output"], "w") as f:
+        json.dump({"images": len(images), "cores": os.cpu_count(), "known_boxes": known,
+                   "baseline_seconds": baseline, "runs": results}, f, indent=2)
+    print(f"\n[INFO] Results written to {args['output']}")
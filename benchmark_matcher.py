@@ -0,0 +1,77 @@
+"""
+Matcher Benchmark
+Compares the pickled SVC against the NumPy nearest-neighbour matcher on
+synthetic 128-d galleries of 50, 500 and 5,000 identities
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import SVC
+from project.utils import SVCMatcher, NearestNeighbourMatcher
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("-s", "--sizes", type=int, nargs="+", default=[50, 500, 5000],
+    help="number of identities in each gallery")
+ap.add_argument("-p", "--per-identity", type=int, default=5,
+    help="encodings per identity")
+ap.add_argument("-f", "--faces", type=int, default=3,
+    help="faces classified per call (faces in one frame)")
+ap.add_argument("-r", "--repeats", type=int, default=50,
+    help="timed calls per matcher")
+ap.add_argument("--svc-max-identities", type=int, default=500,
+    help="skip SVC training above this many identities (one-vs-one training is quadratic)")
+args = vars(ap.parse_args())
+
+rng = np.random.default_rng(42)
+
+def synthetic_gallery(identities, per_identity):
+    """Identity centres spread like dlib encodings, samples jittered around them"""
+    centres = rng.normal(0, 0.09, (identities, 128))
+    encodings = np.repeat(centres, per_identity, axis=0)
+    encodings += rng.normal(0, 0.025, encodings.shape)
+    names = np.repeat([str(i) for i in range(identities)], per_identity)
+    return centres, encodings, names
+
+def time_calls(matcher, queries, repeats):
+    """Milliseconds per classify() call (mean, p95)"""
+    matcher.classify(queries)  # warm up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        matcher.classify(queries)
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.mean(samples), np.percentile(samples, 95)
+
+print(f"{'Identities':<12} {'Matcher':<10} {'Train (s)':<12} {'Mean (ms)':<12} {'p95 (ms)':<12} {'Accuracy':<10}")
+print("-" * 70)
+
+for identities in args["sizes"]:
+    centres, encodings, names = synthetic_gallery(identities, args["per_identity"])
+
+    # Fresh samples of known people, like faces seen at the door
+    truth = rng.integers(0, identities, args["faces"])
+    queries = centres[truth] + rng.normal(0, 0.025, (args["faces"], 128))
+    truth = np.array([str(i) for i in truth])
+
+    matchers = []
+    start = time.perf_counter()
+    matchers.append(("knn", NearestNeighbourMatcher(encodings, names), time.perf_counter() - start))
+
+    if identities <= args["svc_max_identities"]:
+        start = time.perf_counter()
+        le = LabelEncoder()
+        labels = le.fit_transform(names)
+        recognizer = SVC(C=1.0, kernel="linear", probability=True)
+        recognizer.fit(encodings, labels)
+        matchers.append(("svc", SVCMatcher(recognizer, le), time.perf_counter() - start))
+
+    for name, matcher, train_time in matchers:
+        mean_ms, p95_ms = time_calls(matcher, queries, args["repeats"])
+        people, _ = matcher.classify(queries)
+        accuracy = np.mean(people.astype(str) == truth)
+        print(f"{identities:<12} {name:<10} {train_time:<12.2f} {mean_ms:<12.3f} {p95_ms:<12.3f} {accuracy:<10.2f}")
+
+    if identities > args["svc_max_identities"]:
+        print(f"{identities:<12} {'svc':<10} skipped (raise --svc-max-identities to train it)")
@@ -0,0 +1,247 @@
+"""
+End-to-end Pipeline Benchmark
+Replays recorded clips and a labelled face dataset through the same
+detect -> encode -> classify -> store code as recognition.py, for every
+combination of detection method, frame scale and frame skip, and writes
+frames/s, per-stage p50/p95/p99 latency, time-to-check-in and accuracy to JSON.
+
+Clip labels (--labels) are a JSON list such as
+    [{"path": "clips/door1.mp4", "person": "601", "appears": 2.5}]
+where "appears" is the second the employee's face enters the frame.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+import cv2
+import numpy as np
+from project.utils import Conf, AttendanceStore, load_matcher, open_source
+from project.utils.engine import RecognitionEngine
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("-c", "--conf", default="config/config.json",
+    help="path to the input configuration file")
+ap.add_argument("--clips", nargs="*", default=[],
+    help="video files or image folders to replay (unlabelled)")
+ap.add_argument("--labels", default=None,
+    help="JSON list of labelled clips: path, person (employee ID), appears (seconds)")
+ap.add_argument("--dataset", default=None,
+    help="labelled face dataset, one folder per employee ID (default: dataset_path/class)")
+ap.add_argument("--dataset-per-person", type=int, default=5,
+    help="images per employee taken from the dataset (0 = all)")
+ap.add_argument("--detection-method", nargs="+", default=None,
+    help="detection methods to compare (default: detection_method from the config)")
+ap.add_argument("--scale", type=float, nargs="+", default=[0.5],
+    help="frame scales to compare")
+ap.add_argument("--skip", type=int, nargs="+", default=[1],
+    help="recognise every Nth frame; values to compare")
+ap.add_argument("-o", "--output", default="output/benchmark_pipeline.json",
+    help="path to the JSON results")
+args = vars(ap.parse_args())
+
+STAGES = ("read", "detect", "encode", "match", "store", "total")
+REPLAY_START = datetime(2000, 1, 3, 8, 0, 0)  # footage clock for the scratch attendance DB
+
+conf = Conf(args["conf"])
+matcher = load_matcher(conf)
+methods = args["detection_method"] or [conf["detection_method"]]
+
+# Clips: labelled ones first, then unlabelled
+clips = []
+if args["labels"]:
+    with open(args["labels"]) as f:
+        clips.extend(json.load(f))
+clips.extend({"path": path} for path in args["clips"])
+
+dataset_dir = args["dataset"] or os.path.join(conf["dataset_path"], conf["class"])
+
+def percentiles(samples):
+    """p50/p95/p99/mean in milliseconds"""
+    if not samples:
+        return None
+    ms = np.array(samples) * 1000
+    return {
+        "count": len(samples),
+        "mean": round(float(ms.mean()), 2),
+        "p50": round(float(np.percentile(ms, 50)), 2),
+        "p95": round(float(np.percentile(ms, 95)), 2),
+        "p99": round(float(np.percentile(ms, 99)), 2),
+    }
+
+def run_clip(clip, scale, skip, samples, workdir):
+    """Replay one clip as fast as possible; returns its summary"""
+    engine = RecognitionEngine(conf, scale=scale, matcher=matcher)
+    source = open_source(clip["path"], replay="fast")
+    if not source.isOpened():
+        print(f"[WARNING] Could not open {clip['path']}")
+        return None
+    attendance = AttendanceStore(db_path=os.path.join(workdir, "attendance.db"), log=lambda message: None)
+
+    frames = processed = faces_seen = faces_correct = 0
+    first_checkin = {}  # employee_id -> footage seconds
+    start = time.perf_counter()
+    while True:
+        read_start = time.perf_counter()
+        ret, frame = source.read()
+        if not ret:
+            break
+        samples["read"].append(time.perf_counter() - read_start)
+        frames += 1
+        if (frames - 1) % skip:
+            continue
+
+        total_start = time.perf_counter()
+        faces, timings, classified = engine.recognize(engine.shrink(frame), source.position)
+        for stage in ("detect", "encode", "match"):
+            samples[stage].append(timings[stage])
+        processed += 1
+
+        if "person" in clip and source.position >= clip.get("appears", 0):
+            faces_seen += len(faces)
+            faces_correct += sum(1 for (_, person, _, _) in faces if person == clip["person"])
+
+        for person in engine.confirm(faces, classified):
+            store_start = time.perf_counter()
+            result = attendance.store(person, person, REPLAY_START + timedelta(seconds=source.position))
+            samples["store"].append(time.perf_counter() - store_start)
+            if result and person not in first_checkin:
+                first_checkin[person] = source.position
+        samples["total"].append(time.perf_counter() - total_start)
+
+    elapsed = time.perf_counter() - start
+    source.release()
+    attendance.close()
+    os.remove(os.path.join(workdir, "attendance.db"))
+
+    summary = {
+        "path": clip["path"],
+        "frames": frames,
+        "processed": processed,
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        "checked_in": sorted(first_checkin),
+    }
+    if "person" in clip:
+        appears = clip.get("appears", 0)
+        checkin = first_checkin.get(clip["person"])
+        summary["person"] = clip["person"]
+        summary["time_to_checkin"] = round(checkin - appears, 3) if checkin is not None else None
+        summary["false_checkins"] = sorted(p for p in first_checkin if p != clip["person"])
+        summary["face_accuracy"] = round(faces_correct / faces_seen, 4) if faces_seen else None
+    return summary
+
+def run_dataset(scale):
+    """Classify the largest face of each labelled image; returns accuracy and timings"""
+    if not os.path.isdir(dataset_dir):
+        return None
+    engine = RecognitionEngine(conf, scale=scale, matcher=matcher)
+    total = correct = no_face = 0
+    samples = {stage: [] for stage in ("detect", "encode", "match")}
+    for person in sorted(os.listdir(dataset_dir)):
+        folder = os.path.join(dataset_dir, person)
+        if not os.path.isdir(folder):
+            continue
+        images = sorted(f for f in os.listdir(folder) if f.lower().endswith((".png", ".jpg", ".jpeg")))
+        if args["dataset_per_person"] > 0:
+            images = images[:args["dataset_per_person"]]
+
+        for name in images:
+            image = cv2.imread(os.path.join(folder, name))
+            if image is None:
+                continue
+            rgb = cv2.cvtColor(engine.shrink(image), cv2.COLOR_BGR2RGB)
+            total += 1
+
+            start = time.perf_counter()
+            boxes = engine.detect_faces(rgb)
+            samples["detect"].append(time.perf_counter() - start)
+            if not boxes:
+                no_face += 1
+                continue
+            box = max(boxes, key=lambda b: (b[2] - b[0]) * (b[1] - b[3]))
+
+            start = time.perf_counter()
+            encodings = engine.encode(rgb, [box])
+            samples["encode"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            people, _ = matcher.classify(encodings)
+            samples["match"].append(time.perf_counter() - start)
+            correct += int(people[0] == person)
+
+    return {
+        "path": dataset_dir,
+        "images": total,
+        "no_face": no_face,
+        "accuracy": round(correct / total, 4) if total else None,
+        "stages": {stage: percentiles(values) for stage, values in samples.items()},
+    }
+
+results = {
+    "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    "host": {"machine": platform.machine(), "system": platform.system(),
+             "python": platform.python_version(), "cpus": os.cpu_count()},
+    "matcher": conf["matcher"] or "svc",
+    "runs": [],
+}
+
+workdir = tempfile.mkdtemp(prefix="benchmark_pipeline_")
+try:
+    for method, scale, skip in itertools.product(methods, args["scale"], args["skip"]):
+        conf.detection_method = method
+        print(f"[INFO] detection_method={method} scale={scale} skip={skip}")
+        samples = {stage: [] for stage in STAGES}
+        clip_results = []
+        for clip in clips:
+            summary = run_clip(clip, scale, skip, samples, workdir)
+            if summary:
+                clip_results.append(summary)
+                print(f"[INFO]   {summary['path']}: {summary['fps']} fps, "
+                      f"check-in after {summary.get('time_to_checkin', '-')}s")
+
+        frames = sum(c["frames"] for c in clip_results)
+        seconds = sum(c["seconds"] for c in clip_results)
+        checkins = [c["time_to_checkin"] for c in clip_results if c.get("time_to_checkin") is not None]
+        labelled = [c for c in clip_results if "person" in c]
+        run = {
+            "detection_method": method,
+            "scale": scale,
+            "skip": skip,
+            "fps": round(frames / seconds, 2) if seconds > 0 else None,
+            "stages": {stage: percentiles(values) for stage, values in samples.items()},
+            "time_to_checkin": {
+                "mean": round(float(np.mean(checkins)), 3) if checkins else None,
+                "max": round(float(np.max(checkins)), 3) if checkins else None,
+                "missed": sum(1 for c in labelled if c["time_to_checkin"] is None),
+            },
+            "clips": clip_results,
+            "dataset": run_dataset(scale),
+        }
+        if run["dataset"]:
+            print(f"[INFO]   dataset accuracy {run['dataset']['accuracy']} "
+                  f"({run['dataset']['images']} images)")
+        results["runs"].append(run)
+finally:
+    shutil.rmtree(workdir, ignore_errors=True)
+
+# Summary table
+print(f"\n{'Method':<8} {'Scale':<7} {'Skip':<6} {'FPS':<8} {'Detect p95':<12} {'Total p95':<11} {'Check-in (s)':<14} {'Accuracy':<9}")
+print("-" * 80)
+for run in results["runs"]:
+    detect = run["stages"]["detect"] or (run["dataset"] or {}).get("stages", {}).get("detect")
+    total = run["stages"]["total"]
+    accuracy = run["dataset"]["accuracy"] if run["dataset"] else None
+    print(f"{run['detection_method']:<8} {run['scale']:<7} {run['skip']:<6} {str(run['fps']):<8} "
+          f"{str(detect['p95'] if detect else '-'):<12} {str(total['p95'] if total else '-'):<11} "
+          f"{str(run['time_to_checkin']['mean']):<14} {str(accuracy):<9}")
+
+os.makedirs(os.path.dirname(args["output"]) or ".", exist_ok=True)
+with open(args["output"], "w") as f:
+    json.dump(results, f, indent=2)
+print(f"\n[INFO] results written to {args['output']}")
@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from project.utils import Conf
+from project.utils import Conf, crop_face, load_face_boxes, save_face_boxes
 from tinydb import TinyDB, where
 import face_recognition
 import cv2
@@ -116,6 +116,8 @@ def enroll_student():
             # Create directory for storing face images
             student_path = os.path.join(conf["dataset_path"], conf["class"], student_id)
             os.makedirs(student_path, exist_ok=True)
+            # Where the face is in each saved crop, so encoding can skip detection
+            face_boxes = load_face_boxes(student_path)
 
             total_saved = 0
             while total_saved < conf["face_count"]:
@@ -136,15 +138,11 @@ def enroll_student():
                 for (top, right, bottom, left) in boxes:
                     cv2.rectangle(frame, (left, top), (right, bottom), (0,0,255), 2)
 
-                    padding = 70
-                    top = max(0, top - padding)
-                    bottom = min(frame.shape[0], bottom + padding)
-                    left = max(0, left - padding)
-                    right = min(frame.shape[1], right + padding)
-                    face_image = frame_copy[top:bottom, left:right]
+                    face_image, face_box = crop_face(frame_copy, (top, right, bottom, left))
                     if total_saved < conf["face_count"]:
-                        save_path = os.path.join(student_path, f"{str(total_saved).zfill(5)}.png")
-                        cv2.imwrite(save_path, face_image)
+                        file_name = f"{str(total_saved).zfill(5)}.png"
+                        cv2.imwrite(os.path.join(student_path, file_name), face_image)
+                        face_boxes[file_name] = face_box
                         total_saved += 1
                         # Update progress safely using root.after
                         root.after(0, update_progress, total_saved, conf["face_count"])
@@ -157,6 +155,7 @@ def enroll_student():
 
             vs.release()
             cv2.destroyAllWindows()
+            save_face_boxes(student_path, face_boxes)
 
             if not stop_event.is_set():
                 # Add student to database if enrollment was successful
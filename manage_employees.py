@@ -4,16 +4,13 @@ Delete enrollments and re-train model
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, Listbox, Scrollbar
-from project.utils import Conf
+from project.utils import Conf, build_ann_index, export_model, remove_thumbnail, encode_dataset
 from tinydb import TinyDB
 import os
 import shutil
 import pickle
-import numpy as np
-from imutils import paths
 from sklearn.preprocessing import LabelEncoder
 from sklearn.svm import SVC
-import face_recognition
 
 class EmployeeManager:
     def __init__(self, root):
@@ -257,6 +254,7 @@ class EmployeeManager:
                 )
                 if os.path.exists(dataset_path):
                     shutil.rmtree(dataset_path)
+                remove_thumbnail(self.conf, emp_id)
                 
                 deleted_count += 1
                 
@@ -296,26 +294,16 @@ class EmployeeManager:
         self.status_label.config(text="Step 1/2: Encoding faces...")
         self.root.update()
         
-        image_paths = list(paths.list_images(self.conf["dataset_path"]))
-        known_encodings = []
-        known_names = []
+        # Only new or changed images are encoded; the rest come from the encoding cache
+        def progress(done, total):
+            self.status_label.config(text=f"Step 1/2: Encoding faces ({done}/{total})...")
+            self.root.update()
         
-        for (i, image_path) in enumerate(image_paths):
-            name = image_path.split(os.path.sep)[-2]
-            
-            image = face_recognition.load_image_file(image_path)
-            boxes = face_recognition.face_locations(
-                image,
-                model=self.conf["detection_method"]
-            )
-            encodings = face_recognition.face_encodings(image, boxes)
-            
-            for encoding in encodings:
-                known_encodings.append(encoding)
-                known_names.append(name)
+        data, summary = encode_dataset(self.conf, progress)
+        known_encodings = data["encodings"]
+        known_names = data["names"]
         
         # Save encodings
-        data = {"encodings": known_encodings, "names": known_names}
         with open(self.conf["encodings_path"], "wb") as f:
             f.write(pickle.dumps(data))
         
@@ -336,6 +324,12 @@ class EmployeeManager:
         with open(self.conf["le_path"], "wb") as f:
             f.write(pickle.dumps(le))
         
+        # Rebuild the approximate nearest-neighbour index
+        build_ann_index(self.conf, known_encodings, known_names)
+
+        # Export the compact model the kiosk loads without sklearn
+        export_model(self.conf, recognizer, le, known_encodings, known_names)
+        
         self.status_label.config(text="Model re-trained successfully!")
 
 def main():
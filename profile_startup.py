@@ -0,0 +1,93 @@
+"""
+Startup Import Profile
+Measures what each import of recognition.py costs, in the order the script
+imports them, in a fresh interpreter, and checks the imports before the splash
+against the startup budget. --detail lists the slowest individual modules from
+python -X importtime.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# recognition.py's imports, in order; the first group runs before the splash
+BEFORE_SPLASH = ["tkinter", "tkinter.messagebox"]
+AFTER_SPLASH = [
+    "threading", "cv2", "numpy", "PIL.Image", "PIL.ImageTk",
+    "project.utils", "project.utils.engine", "project.utils.render",
+    # pulled in when the models load (dlib; sklearn only for the legacy pickles)
+    "project.utils.model", "face_recognition",
+]
+
+# Runs in the child interpreter: import each module in turn and time it
+CHILD = """
+import importlib, json, sys, time
+results = []
+for name in json.loads(sys.argv[1]):
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    results.append((name, (time.perf_counter() - start) * 1000, error))
+print(json.dumps(results))
+"""
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("--budget", type=float, default=300.0,
+    help="milliseconds allowed before the splash is shown")
+ap.add_argument("--detail", type=int, default=0,
+    help="also list this many slowest modules by self time (python -X importtime)")
+ap.add_argument("--runs", type=int, default=3,
+    help="fresh interpreters to average over")
+args = vars(ap.parse_args())
+
+modules = BEFORE_SPLASH + AFTER_SPLASH
+totals = {name: [] for name in modules}
+errors = {}
+for _ in range(args["runs"]):
+    out = subprocess.run([sys.executable, "-c", CHILD, json.dumps(modules)],
+                         capture_output=True, text=True, check=True).stdout
+    for name, ms, error in json.loads(out):
+        totals[name].append(ms)
+        if error:
+            errors[name] = error
+
+print(f"\n{'Module':<26} {'Phase':<14} {'Import (ms)':<12}")
+print("-" * 54)
+phase_ms = {"before splash": 0.0, "after splash": 0.0}
+for name in modules:
+    phase = "before splash" if name in BEFORE_SPLASH else "after splash"
+    ms = sum(totals[name]) / len(totals[name])
+    phase_ms[phase] += ms
+    note = f"  (not importable: {errors[name]})" if name in errors else ""
+    print(f"{name:<26} {phase:<14} {ms:<12.1f}{note}")
+
+print("-" * 54)
+for phase, ms in phase_ms.items():
+    print(f"{'total ' + phase:<41} {ms:.1f}")
+
+if args["detail"] > 0:
+    code = "import importlib\n" + "".join(
+        f"try:\n    importlib.import_module({name!r})\nexcept Exception:\n    pass\n" for name in modules)
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    print(f"\n{'Slowest modules (self time)':<44} {'Self (ms)':<10} {'Cumulative (ms)':<15}")
+    print("-" * 70)
+    for self_us, cumulative_us, module in sorted(rows, reverse=True)[:args["detail"]]:
+        print(f"{module:<44} {self_us / 1000:<10.1f} {cumulative_us / 1000:<15.1f}")
+
+if phase_ms["before splash"] > args["budget"]:
+    print(f"\n[FAIL] imports before the splash take {phase_ms['before splash']:.0f} ms "
+          f"(budget {args['budget']:.0f} ms)")
+    raise SystemExit(1)
+print(f"\n[PASS] imports before the splash take {phase_ms['before splash']:.0f} ms "
+      f"(budget {args['budget']:.0f} ms)")
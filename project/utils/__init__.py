@@ -1,4 +1,23 @@
 __author__ = 'adrianrosebrock'
 
 # import the necessary packages
-from .conf import Conf
\ No newline at end of file
+from .conf import Conf
+from .pipeline import FrameGrabber, RecognitionWorker
+from .tracker import FaceTracker
+from .matcher import SVCMatcher, NearestNeighbourMatcher, load_matcher
+from .ann import IVFIndex, build_ann_index
+from .model import CompactSVCMatcher, export_model
+from .watcher import ModelWatcher, RosterWatcher
+from .scheduler import AdaptiveScheduler, RateMeter
+from .motion import MotionDetector
+from .roi import DetectionRegion
+from .attendance import AttendanceStore
+from .camera import open_camera, open_device, configure_camera, print_camera_help
+from .roster import load_roster, read_roster
+from .multicam import CameraChannel
+from .sources import CaptureSource, VideoFileSource, ImageSequenceSource, open_source
+from .metrics import METRICS, start_exporters, write_textfile, textfile_path
+from .voting import TemporalVoter
+from .encoding import encode_dataset, encode_files, list_images, EncodingCache
+from .encoding import crop_face, face_boxes_for, load_face_boxes, save_face_boxes
+from .thumbnails import ThumbnailCache, build_thumbnail, remove_thumbnail
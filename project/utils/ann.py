@@ -0,0 +1,221 @@
+"""
+Approximate nearest-neighbour index for large employee galleries
+IVF: a k-means coarse quantizer splits the encodings into cells and a query
+only scans the few cells closest to it. Optional product quantization (PQ)
+stores each encoding as a handful of bytes instead of 512.
+"""
+import os
+import numpy as np
+from .matcher import UNKNOWN, distance_to_confidence
+
+INDEX_VERSION = 1
+
+
+def squared_distances(queries, points, points_sq=None):
+    """Pairwise squared L2 distances, (len(queries), len(points))"""
+    if points_sq is None:
+        points_sq = np.einsum("ij,ij->i", points, points)
+    dists = points_sq[np.newaxis, :] - 2.0 * (queries @ points.T)
+    dists += np.einsum("ij,ij->i", queries, queries)[:, np.newaxis]
+    return np.maximum(dists, 0, out=dists)
+
+
+def assign_nearest(data, centroids, chunk=8192):
+    """Index of the closest centroid for every row, computed in chunks to bound memory"""
+    centroids_sq = np.einsum("ij,ij->i", centroids, centroids)
+    assign = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), chunk):
+        block = data[start:start + chunk]
+        assign[start:start + chunk] = np.argmin(squared_distances(block, centroids, centroids_sq), axis=1)
+    return assign
+
+
+def kmeans(data, k, n_iter=20, seed=0, max_samples=None):
+    """Plain Lloyd's k-means; trains on a random sample when max_samples is set"""
+    rng = np.random.default_rng(seed)
+    if max_samples and len(data) > max_samples:
+        data = data[rng.choice(len(data), max_samples, replace=False)]
+
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = assign_nearest(data, centroids)
+        counts = np.bincount(assign, minlength=k)
+
+        # Per-cell sums via one sort + reduceat instead of a Python loop
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        sums = np.add.reduceat(data[order], starts[filled], axis=0)
+        centroids[filled] = sums / counts[filled, np.newaxis]
+
+        # Re-seed empty cells from random points so every cell stays useful
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """Inverted-file index with optional product quantization of the residuals"""
+
+    def __init__(self, centroids, offsets, ids, labels, classes, vectors=None,
+                 pq_codebooks=None, pq_codes=None, nprobe=8, tolerance=0.6):
+        self.centroids = centroids
+        self.centroids_sq = np.einsum("ij,ij->i", centroids, centroids)
+        self.offsets = offsets  # cell c owns rows offsets[c]:offsets[c + 1]
+        self.ids = ids  # row -> index in the original encodings list
+        self.labels = labels  # row -> index into classes_
+        self.classes_ = classes
+        self.vectors = vectors  # float32 rows, None when PQ is used
+        self.pq_codebooks = pq_codebooks  # (m, 256, 128 / m)
+        self.pq_codes = pq_codes  # (rows, m) uint8
+        self.nprobe = nprobe
+        self.tolerance = tolerance
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, encodings, names, n_lists=None, pq_subvectors=0, n_iter=20, seed=0,
+              nprobe=8, tolerance=0.6):
+        data = np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, 128)
+        if not n_lists:
+            n_lists = max(1, int(round(np.sqrt(len(data)))))
+        n_lists = min(n_lists, len(data))
+
+        centroids = kmeans(data, n_lists, n_iter=n_iter, seed=seed, max_samples=256 * n_lists)
+        assign = assign_nearest(data, centroids)
+
+        # Store the rows grouped by cell so each list is one contiguous slice
+        order = np.argsort(assign, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        classes, labels = np.unique(np.asarray(names), return_inverse=True)
+        vectors = data[order]
+
+        pq_codebooks = pq_codes = None
+        if pq_subvectors:
+            if 128 % pq_subvectors:
+                raise ValueError("pq_subvectors must divide 128")
+            residuals = vectors - centroids[assign[order]]
+            pq_codebooks, pq_codes = train_product_quantizer(residuals, pq_subvectors, n_iter, seed)
+            vectors = None
+
+        return cls(centroids, offsets.astype(np.int64), order.astype(np.int64), labels[order].astype(np.int64),
+                   classes, vectors, pq_codebooks, pq_codes, nprobe, tolerance)
+
+    def search(self, encodings, k=1, nprobe=None):
+        """Top-k over the nprobe closest cells: (indices into the original encodings, distances)"""
+        rows, dists = self._search_rows(encodings, k, nprobe)
+        # Report gallery positions, like an exact search would
+        return np.where(rows >= 0, self.ids[np.maximum(rows, 0)], -1), dists
+
+    def _search_rows(self, encodings, k, nprobe):
+        queries = np.asarray(encodings, dtype=np.float32).reshape(-1, 128)
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+
+        coarse = squared_distances(queries, self.centroids, self.centroids_sq)
+        if nprobe < self.n_lists:
+            cells = np.argpartition(coarse, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            cells = np.tile(np.arange(self.n_lists), (len(queries), 1))
+
+        rows_out = np.full((len(queries), k), -1, dtype=np.int64)
+        dists_out = np.full((len(queries), k), np.inf, dtype=np.float32)
+        for i, query in enumerate(queries):
+            rows, dists = self._scan(query, cells[i])
+            if len(rows) == 0:
+                continue
+            top = min(k, len(rows))
+            best = np.argpartition(dists, top - 1)[:top] if top < len(rows) else np.arange(len(rows))
+            best = best[np.argsort(dists[best])]
+            rows_out[i, :top] = rows[best]
+            dists_out[i, :top] = np.sqrt(dists[best])
+        return rows_out, dists_out
+
+    def _scan(self, query, cells):
+        """Candidate rows of the probed cells and their squared distances to the query"""
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells])
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+
+        if self.vectors is not None:
+            diff = self.vectors[rows] - query
+            return rows, np.einsum("ij,ij->i", diff, diff)
+
+        # Asymmetric distance: per cell, a lookup table of residual-to-codeword distances
+        m, _, sub = self.pq_codebooks.shape
+        dists = np.empty(len(rows), dtype=np.float32)
+        pos = 0
+        for c in cells:
+            start, end = self.offsets[c], self.offsets[c + 1]
+            if start == end:
+                continue
+            residual = (query - self.centroids[c]).reshape(m, 1, sub)
+            tables = ((self.pq_codebooks - residual) ** 2).sum(axis=2)  # (m, 256)
+            codes = self.pq_codes[start:end]
+            dists[pos:pos + end - start] = tables[np.arange(m), codes].sum(axis=1)
+            pos += end - start
+        return rows, dists
+
+    def classify(self, encodings):
+        rows, dists = self._search_rows(encodings, 1, None)
+        rows, dists = rows[:, 0], dists[:, 0]
+        people = self.classes_[self.labels[np.maximum(rows, 0)]].astype(object)
+
+        # Anything further than the tolerance (or no candidate at all) is nobody we know
+        people[(rows < 0) | (dists > self.tolerance)] = UNKNOWN
+        return people, distance_to_confidence(np.minimum(dists, 2.0), self.tolerance)
+
+    def save(self, path):
+        """Write the index as an .npz next to the recognizer (atomic replace)"""
+        arrays = {
+            "version": np.array(INDEX_VERSION),
+            "centroids": self.centroids,
+            "offsets": self.offsets,
+            "ids": self.ids,
+            "labels": self.labels,
+            "classes": self.classes_.astype(str),
+        }
+        if self.vectors is not None:
+            arrays["vectors"] = self.vectors
+        else:
+            arrays["pq_codebooks"] = self.pq_codebooks
+            arrays["pq_codes"] = self.pq_codes
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, nprobe=8, tolerance=0.6):
+        data = np.load(path, allow_pickle=False)
+        if int(data["version"]) != INDEX_VERSION:
+            raise ValueError(f"Unsupported ANN index version {int(data['version'])} in {path}")
+        vectors = data["vectors"] if "vectors" in data else None
+        pq_codebooks = data["pq_codebooks"] if "pq_codebooks" in data else None
+        pq_codes = data["pq_codes"] if "pq_codes" in data else None
+        return cls(data["centroids"], data["offsets"], data["ids"], data["labels"], data["classes"],
+                   vectors, pq_codebooks, pq_codes, nprobe, tolerance)
+
+
+def train_product_quantizer(residuals, m, n_iter=20, seed=0):
+    """Split 128-d residuals into m sub-vectors and learn 256 codewords for each"""
+    sub = residuals.shape[1] // m
+    n_codes = min(256, len(residuals))
+    codebooks = np.zeros((m, 256, sub), dtype=np.float32)
+    codes = np.empty((len(residuals), m), dtype=np.uint8)
+    for j in range(m):
+        part = np.ascontiguousarray(residuals[:, j * sub:(j + 1) * sub])
+        codebooks[j, :n_codes] = kmeans(part, n_codes, n_iter=n_iter, seed=seed + j, max_samples=256 * 64)
+        codes[:, j] = assign_nearest(part, codebooks[j, :n_codes])
+    return codebooks, codes
+
+
+def build_ann_index(conf, encodings, names):
+    """Build the index from the training encodings and save it to ann_index_path"""
+    index = IVFIndex.build(encodings, names, n_lists=conf["ann_lists"],
+                           pq_subvectors=conf["ann_pq_subvectors"] or 0)
+    index.save(conf["ann_index_path"])
+    return index
@@ -0,0 +1,243 @@
+"""
+Attendance storage
+SQLite attendance table with an in-memory cache of today's records and the
+check-out cooldown, shared by the GUI and the headless service. The cache is
+authoritative: store() updates it immediately and the database rows are
+written behind by a writer thread that commits events in batches.
+"""
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from .database import connect, ensure_schema
+from .metrics import METRICS
+
+COOLDOWN_MINUTES = 10  # minutes after a check-out during which detections are ignored
+
+CHECKIN_SQL = '''
+    INSERT INTO attendance (employee_id, employee_name, date, check_in, check_out, working_hours)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(employee_id, date)
+    DO UPDATE SET
+        check_in = excluded.check_in,
+        updated_at = datetime('now')
+'''
+
+CHECKOUT_SQL = '''
+    INSERT INTO attendance (employee_id, employee_name, date, check_in, check_out, working_hours, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+    ON CONFLICT(employee_id, date)
+    DO UPDATE SET
+        check_out = excluded.check_out,
+        working_hours = excluded.working_hours,
+        updated_at = datetime('now')
+'''
+
+
+class AttendanceWriter:
+    """Writer thread that drains queued UPSERTs into one transaction per batch
+
+    Events arriving within flush_interval of each other share a commit (and its
+    fsync); stop() writes everything still queued before returning."""
+
+    def __init__(self, db_path, flush_interval=0.5, max_batch=256, retries=3, log=print):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retries = retries
+        self.log = log
+        self.events = queue.Queue()
+        self.written = 0
+        self.failed = 0
+        self.thread = threading.Thread(target=self._run, name="AttendanceWriter", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def put(self, sql, params):
+        self.events.put((sql, params))
+
+    def pending(self):
+        return self.events.qsize()
+
+    def _run(self):
+        conn = connect(self.db_path)
+        stopping = False
+        while not stopping:
+            event = self.events.get()
+            if event is None:
+                break
+            batch = [event]
+
+            # Gather whatever else arrives shortly after, up to max_batch
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    event = self.events.get(timeout=max(0.0, deadline - time.time()))
+                except queue.Empty:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            self._write(conn, batch)
+        conn.close()
+
+    def _write(self, conn, batch):
+        for attempt in range(1, self.retries + 1):
+            try:
+                with METRICS.timer("db_commit"):
+                    with conn:  # one transaction for the whole batch
+                        for sql, params in batch:
+                            conn.execute(sql, params)
+                self.written += len(batch)
+                METRICS.inc("db_batches")
+                METRICS.inc("db_events", len(batch))
+                return
+            except sqlite3.Error as e:
+                self.log(f"Attendance write failed (attempt {attempt}/{self.retries}): {e}")
+                time.sleep(0.2 * attempt)
+        self.failed += len(batch)
+        METRICS.inc("db_events_failed", len(batch))
+
+    def stop(self, timeout=10.0):
+        """Flush everything queued, then stop the thread"""
+        self.events.put(None)
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+
+class AttendanceStore:
+    """IN/OUT attendance tracking backed by database/attendance.db"""
+
+    def __init__(self, db_path="database/attendance.db", cooldown_minutes=COOLDOWN_MINUTES, log=print,
+                 flush_interval=0.5):
+        self.cooldown_minutes = cooldown_minutes
+        self.log = log
+        # Several camera threads may record attendance at once
+        self.lock = threading.Lock()
+        # Create attendance table if not exists (and switch the file to WAL)
+        ensure_schema(db_path)
+        # Reads for the cache; all writes go through the writer thread
+        self.conn = connect(db_path, readonly=True, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+
+        # Cache for today's attendance to reduce database queries
+        self.cache = {}
+        self.cache_date = datetime.now().strftime("%Y-%m-%d")
+
+        # Cooldown tracking: employee_id -> last_checkout_timestamp
+        self.cooldown = {}
+
+        self.load_today()
+
+        # Database writes happen on the writer thread, off the video/recognition loop
+        self.writer = AttendanceWriter(db_path, flush_interval=flush_interval, log=log).start()
+
+    def load_today(self, today=None):
+        """Load today's (or the given date's) attendance into the cache"""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        self.cache_date = today
+
+        self.cursor.execute('''
+            SELECT employee_id, employee_name, check_in, check_out, working_hours
+            FROM attendance
+            WHERE date = ?
+        ''', (today,))
+
+        rows = self.cursor.fetchall()
+        self.cache = {}
+        for row in rows:
+            emp_id, emp_name, check_in, check_out, working_hours = row
+            self.cache[emp_id] = {
+                'name': emp_name,
+                'check_in': check_in,
+                'check_out': check_out,
+                'working_hours': working_hours
+            }
+
+    def store(self, name, id, when=None):
+        """Record a check-in (first sighting today) or update the check-out
+
+        when is the sighting time (datetime) for replayed footage; defaults to now.
+        Returns (message, action_type, id, time_str, hours), or None when nothing
+        was recorded (unknown face or cooldown)."""
+        with self.lock, METRICS.timer("store"):
+            return self._store(name, id, when or datetime.now())
+
+    def _store(self, name, id, now):
+        if not name or name.lower() == "unknown":
+            self.log("Face not recognized, attendance not stored.")
+            return None
+
+        current_date = now.strftime("%Y-%m-%d")
+        current_time = now.strftime("%Y-%m-%d %H:%M:%S")
+        current_timestamp = now
+
+        # Check if employee is in cooldown period (10 minutes after last checkout)
+        if id in self.cooldown:
+            time_since_checkout = (current_timestamp - self.cooldown[id]).total_seconds() / 60
+            if time_since_checkout < self.cooldown_minutes:
+                remaining = self.cooldown_minutes - int(time_since_checkout)
+                self.log(f"Employee {name} (ID: {id}) is in cooldown. {remaining} minutes remaining.")
+                return None  # Ignore detection during cooldown
+
+        # Check if date changed (new day) - reload cache
+        if current_date != self.cache_date:
+            self.load_today(current_date)
+
+        # Check if employee has any record today in cache
+        if id in self.cache:
+            employee_record = self.cache[id]
+
+            # Same day - update check_out time (allows multiple updates)
+            self.cache[id]['check_out'] = current_time
+            self.log(f"Check-OUT updated for {name} (ID: {id}) at {current_time}")
+
+            # Calculate working hours
+            check_in_dt = datetime.strptime(employee_record['check_in'], "%Y-%m-%d %H:%M:%S")
+            check_out_dt = datetime.strptime(current_time, "%Y-%m-%d %H:%M:%S")
+            duration = check_out_dt - check_in_dt
+            hours = duration.total_seconds() / 3600
+            self.cache[id]['working_hours'] = round(hours, 2)
+
+            # Queue the UPSERT for the writer thread
+            self.writer.put(CHECKOUT_SQL, (id, name, current_date, employee_record['check_in'], current_time, round(hours, 2)))
+            METRICS.inc("checkouts")
+
+            # Set cooldown timer
+            self.cooldown[id] = current_timestamp
+            self.log(f"Cooldown activated for {name} (ID: {id}) - {self.cooldown_minutes} minutes")
+
+            return f"Check-OUT Updated: {name} | Total hours: {round(hours, 2)}h", "checkout", id, current_time, round(hours, 2)
+        else:
+            # First check-in of the day
+            self.cache[id] = {
+                "name": name,
+                "check_in": current_time,
+                "check_out": None,
+                "working_hours": 0
+            }
+
+            # Clear cooldown on new check-in (new day)
+            if id in self.cooldown:
+                del self.cooldown[id]
+
+            self.log(f"Check-IN recorded for {name} (ID: {id}) at {current_time}")
+
+            # Queue the insert for the writer thread
+            self.writer.put(CHECKIN_SQL, (id, name, current_date, current_time, None, 0))
+            METRICS.inc("checkins")
+
+            return f"Check-IN: {name} marked present at {current_time.split(' ')[1]}", "checkin", id, current_time, 0
+
+    def close(self):
+        """Flush queued writes and close the database"""
+        if self.writer.thread.is_alive():
+            self.writer.stop()
+            if self.writer.pending():
+                self.log(f"[WARNING] {self.writer.pending()} attendance events were not written")
+        self.conn.close()
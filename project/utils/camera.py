@@ -0,0 +1,92 @@
+"""
+Camera helpers shared by the recognition GUI and the headless service
+"""
+import json
+import os
+import platform
+import cv2
+
+
+def camera_candidates():
+    """(index, backend) pairs to probe, in the order the platform prefers them"""
+    if platform.system() == 'Windows':
+        return [(0, cv2.CAP_DSHOW)]
+    # For Raspberry Pi 5 and other Linux systems: V4L2 backend with multiple
+    # indices, then the default backend
+    return [(idx, cv2.CAP_V4L2) for idx in [0, 1, 2]] + [(idx, cv2.CAP_ANY) for idx in [0, 1, 2]]
+
+
+def load_camera_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        return int(cached["index"]), int(cached["backend"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_camera_cache(cache_path, index, backend):
+    try:
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump({"index": index, "backend": backend}, f)
+    except OSError as e:
+        print(f"[WARNING] Could not save camera cache: {e}")
+
+
+def open_camera(cache_path=None):
+    """Open camera with best available method for the platform
+
+    The index/backend that worked last time (cache_path) is tried first, so a
+    normal start opens one device instead of probing all of them."""
+    candidates = camera_candidates()
+    if platform.system() == 'Windows':
+        return cv2.VideoCapture(*candidates[0])
+
+    cached = load_camera_cache(cache_path) if cache_path else None
+    if cached is not None:
+        candidates = [cached] + [c for c in candidates if c != cached]
+
+    for idx, backend in candidates:
+        cap = cv2.VideoCapture(idx, backend)
+        if cap.isOpened():
+            ret, _ = cap.read()
+            if ret:
+                # Keep the device open (no release/reopen round trip)
+                if cache_path and (idx, backend) != cached:
+                    save_camera_cache(cache_path, idx, backend)
+                return cap
+        cap.release()
+
+    return cv2.VideoCapture(0)
+
+
+def open_device(index):
+    """Open one specific camera index with the platform's preferred backend"""
+    if platform.system() == 'Windows':
+        return cv2.VideoCapture(index, cv2.CAP_DSHOW)
+    cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    if cap.isOpened():
+        return cap
+    cap.release()
+    return cv2.VideoCapture(index)
+
+
+def configure_camera(vs, width=640, height=480, fps=30):
+    """Request the capture size and rate recognition is tuned for"""
+    vs.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    vs.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    vs.set(cv2.CAP_PROP_FPS, fps)
+
+
+def print_camera_help():
+    """Checklist printed when no camera could be opened"""
+    print("[ERROR] Failed to open camera!")
+    print("Please check:")
+    print("  1. Camera is connected properly")
+    print("  2. Camera permissions are granted")
+    print("  3. No other application is using the camera")
+    print("  4. Run diagnostic: python3 test_camera.py")
+    print("  5. On Raspberry Pi 5: Camera might be at different index")
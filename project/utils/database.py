@@ -0,0 +1,148 @@
+"""
+SQLite connection factory
+Every script opens database/attendance.db through here, so the kiosk writer
+and report readers agree on WAL journaling and the tuned pragmas. Readers take
+pooled read-only connections, which never block (or wait for) the writer.
+"""
+import os
+import queue
+import sqlite3
+import threading
+
+ATTENDANCE_DB = "database/attendance.db"
+
+# WAL lets reports read while the kiosk writes; synchronous=NORMAL is durable
+# across application crashes in WAL mode and skips the fsync per commit
+PRAGMAS = {
+    "synchronous": "NORMAL",
+    "cache_size": -8000,  # KiB (8 MB page cache per connection)
+    "mmap_size": 64 * 1024 * 1024,
+    "busy_timeout": 5000,  # ms to wait for a lock instead of failing at once
+    "temp_store": "MEMORY",
+}
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id TEXT NOT NULL,
+        employee_name TEXT NOT NULL,
+        date TEXT NOT NULL,
+        check_in TEXT NOT NULL,
+        check_out TEXT,
+        working_hours REAL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(employee_id, date)
+    )
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_employee_date
+    ON attendance(employee_id, date)
+    ''',
+]
+
+
+def connect(db_path=ATTENDANCE_DB, readonly=False, check_same_thread=True):
+    """Open a tuned connection; read-only connections cannot write even by accident"""
+    if readonly:
+        uri = "file:" + os.path.abspath(db_path).replace("\\", "/") + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    else:
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+        # The journal mode is stored in the file, so setting it once is enough
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    if readonly:
+        conn.execute("PRAGMA query_only=1")
+    return conn
+
+
+def ensure_schema(db_path=ATTENDANCE_DB):
+    """Create the attendance table (and switch the file to WAL) if needed"""
+    conn = connect(db_path)
+    try:
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+    finally:
+        conn.close()
+
+
+class PooledConnection:
+    """A pooled read-only connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+
+class ReadPool:
+    """Up to size read-only connections reused across reports"""
+
+    def __init__(self, db_path=ATTENDANCE_DB, size=4):
+        self.db_path = db_path
+        self.size = size
+        self.idle = queue.LifoQueue()
+        self.created = 0
+        self.lock = threading.Lock()
+        ensure_schema(db_path)
+
+    def acquire(self, timeout=None):
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                grow = self.created < self.size
+                if grow:
+                    self.created += 1
+            if grow:
+                conn = connect(self.db_path, readonly=True, check_same_thread=False)
+            else:
+                conn = self.idle.get(timeout=timeout)
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self.idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def read_connection(db_path=ATTENDANCE_DB):
+    """A read-only connection from the process-wide pool for db_path; close() returns it"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ReadPool(db_path)
+    return pool.acquire()
@@ -0,0 +1,239 @@
+"""
+Dataset encoding
+The one encode path shared by encode_faces.py, auto_enroll.py and
+manage_employees.py, with a persistent per-image cache: an image is only
+re-encoded when it is new or its content changed, and deleted images drop
+out, so enrolling one employee costs their own images and nothing more.
+Images that do need encoding are spread over a pool of processes.
+Enrollment records where the face is in every crop it saves, so encoding
+those crops skips face detection altogether.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from .metrics import METRICS
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+
+# Stored with the cache; entries made by a different encode path are redone
+ENCODER_VERSION = "gray3-v1"
+
+FACE_BOXES = "boxes.json"  # per-employee sidecar: image file name -> (top, right, bottom, left)
+PADDING = 70  # pixels of context saved around each enrolled face
+
+
+def list_images(dataset_dir):
+    """Every image below dataset_dir, sorted so the encodings come out in a stable order"""
+    images = []
+    for directory, _, files in os.walk(dataset_dir):
+        images.extend(os.path.join(directory, f) for f in files if f.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(images)
+
+
+def gray3(image):
+    """The 3-channel grayscale image the encoders have always been given
+
+    Encodings were made from BGR -> RGB -> (BGR2GRAY) -> 3 channels, i.e. gray
+    with the red and blue weights swapped; RGB2GRAY on the BGR image applies
+    exactly those weights (bit for bit) in one conversion."""
+    return cv2.cvtColor(cv2.cvtColor(image, cv2.COLOR_RGB2GRAY), cv2.COLOR_GRAY2RGB)
+
+
+def crop_face(frame, box, padding=PADDING):
+    """The padded crop enrollment saves around a detected face, and the face's box inside it"""
+    (top, right, bottom, left) = box
+    y0, y1 = max(0, top - padding), min(frame.shape[0], bottom + padding)
+    x0, x1 = max(0, left - padding), min(frame.shape[1], right + padding)
+    return frame[y0:y1, x0:x1], (top - y0, right - x0, bottom - y0, left - x0)
+
+
+def load_face_boxes(folder):
+    """{image file name: face box} recorded by enrollment for this folder, {} if none"""
+    try:
+        with open(os.path.join(folder, FACE_BOXES)) as f:
+            return {name: tuple(box) for name, box in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_face_boxes(folder, boxes):
+    """Write the folder's sidecar (atomic replace)"""
+    path = os.path.join(folder, FACE_BOXES)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({name: [int(v) for v in box] for name, box in sorted(boxes.items())}, f)
+    os.replace(tmp_path, path)
+
+
+def face_boxes_for(paths):
+    """The recorded face box of every image (None where enrollment did not record one)"""
+    sidecars = {}
+    boxes = []
+    for path in paths:
+        folder = os.path.dirname(path)
+        if folder not in sidecars:
+            sidecars[folder] = load_face_boxes(folder)
+        boxes.append(sidecars[folder].get(os.path.basename(path)))
+    return boxes
+
+
+def encode_file(path, box=None):
+    """128-d encodings of the face at box, or of every face detected when box is None,
+    and the seconds spent loading and encoding the image
+
+    Returns the timings rather than recording them: in a pool worker METRICS is
+    the worker's own copy, so encode_files records them in the parent."""
+    import face_recognition
+    start = time.perf_counter()
+    image = cv2.imread(path)
+    timings = {"load_image": time.perf_counter() - start}
+    if image is None:
+        return [], timings
+    start = time.perf_counter()
+    encodings = face_recognition.face_encodings(gray3(image), known_face_locations=[box] if box else None)
+    timings["encode"] = time.perf_counter() - start
+    return encodings, timings
+
+
+def init_worker():
+    """Load dlib's models once per worker process, not once per image"""
+    import face_recognition
+    return face_recognition
+
+
+def encoding_workers(conf, workers=None):
+    """Processes to encode with: the argument, else encoding_workers, else every core"""
+    return max(1, workers or conf["encoding_workers"] or os.cpu_count() or 1)
+
+
+def encode_files(paths, workers=1, progress=None, boxes=None):
+    """encode_file for every path (with its face box, if known), in order, on up to workers processes
+
+    Work is handed out in chunks; progress(done, total) is called as results
+    arrive (in order, so it can trail the fastest worker slightly)."""
+    paths = list(paths)
+    boxes = list(boxes) if boxes is not None else [None] * len(paths)
+    results = []
+
+    def collect(encodings, timings):
+        for stage, seconds in timings.items():
+            METRICS.observe(stage, seconds)
+        results.append(encodings)
+        if progress is not None:
+            progress(len(results), len(paths))
+
+    # A pool only pays off once each worker gets a few images (spawning one loads dlib)
+    if workers <= 1 or len(paths) < 2 * workers:
+        for path, box in zip(paths, boxes):
+            collect(*encode_file(path, box))
+        return results
+
+    chunksize = max(1, min(8, len(paths) // (workers * 4)))
+    # spawn: the GUIs call this from a worker thread with Tk running, which is not
+    # safe to fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker) as pool:
+        for encodings, timings in pool.map(encode_file, paths, boxes, chunksize=chunksize):
+            collect(encodings, timings)
+    METRICS.inc("images_encoded_parallel", len(paths))
+    return results
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class EncodingCache:
+    """Encodings per image, keyed by the path relative to the dataset
+
+    An entry is reused while the file's mtime and size are unchanged, or, when
+    they changed (copied, touched), while its content hash still matches."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # relative path -> {"mtime", "size", "sha1", "encodings"}
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("encoder") == ENCODER_VERSION:
+                self.entries = data["entries"]
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError, AttributeError):
+            pass  # no (usable) cache yet: everything is encoded once
+
+    def lookup(self, key, path, box=None):
+        """Cached encodings for the file, or None if it has to be encoded"""
+        entry = self.entries.get(key)
+        if entry is None or entry.get("box") != box:
+            return None
+        st = os.stat(path)
+        if entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            return entry["encodings"]
+        if entry["size"] == st.st_size and entry["sha1"] == file_digest(path):
+            entry["mtime"] = st.st_mtime_ns
+            return entry["encodings"]
+        return None
+
+    def store(self, key, path, encodings, box=None):
+        st = os.stat(path)
+        self.entries[key] = {"mtime": st.st_mtime_ns, "size": st.st_size, "sha1": file_digest(path),
+                             "box": box, "encodings": [np.asarray(e) for e in encodings]}
+
+    def prune(self, keys):
+        """Drop the entries of images that no longer exist"""
+        removed = [key for key in self.entries if key not in keys]
+        for key in removed:
+            del self.entries[key]
+        return len(removed)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"encoder": ENCODER_VERSION, "entries": self.entries}, f)
+        os.replace(tmp_path, self.path)
+
+
+def encode_dataset(conf, progress=None, workers=None):
+    """Encodings and names for the whole dataset, encoding only new or changed images
+
+    progress(done, total) is called after each image that had to be encoded;
+    workers defaults to encoding_workers (0: one per core).
+    Returns {"encodings", "names"} (the encodings.pickle layout) and a summary
+    {"images", "encoded", "cached", "removed", "detected"}; detected counts the
+    encoded images without a recorded face box, which needed face detection."""
+    dataset_dir = os.path.join(conf["dataset_path"], conf["class"])
+    cache = EncodingCache(conf["encoding_cache_path"] or "output/encoding_cache.pickle")
+
+    images = list_images(dataset_dir)
+    keys = [os.path.relpath(path, dataset_dir).replace(os.sep, "/") for path in images]
+    removed = cache.prune(set(keys))
+
+    boxes = face_boxes_for(images)
+    todo = [(key, path, box) for key, path, box in zip(keys, images, boxes)
+            if cache.lookup(key, path, box) is None]
+    results = encode_files([path for _, path, _ in todo], encoding_workers(conf, workers), progress,
+                           boxes=[box for _, _, box in todo])
+    for (key, path, box), encodings in zip(todo, results):
+        cache.store(key, path, encodings, box)
+    cache.save()
+
+    encodings, names = [], []
+    for key, path in zip(keys, images):
+        # The employee ID is the image's folder
+        name = os.path.basename(os.path.dirname(path))
+        for encoding in cache.entries[key]["encodings"]:
+            encodings.append(encoding)
+            names.append(name)
+
+    summary = {"images": len(images), "encoded": len(todo), "cached": len(images) - len(todo), "removed": removed,
+               "detected": sum(1 for _, _, box in todo if box is None)}
+    return {"encodings": encodings, "names": names}, summary
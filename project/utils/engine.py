@@ -0,0 +1,176 @@
+"""
+Recognition engine
+Detect -> track -> encode -> match on downscaled frames, plus the per-person
+confirmation that decides when a face is stable enough to record attendance.
+Used by both recognition.py (Tk) and the headless recognition service.
+Detection and encoding can be handed to a shared process pool so several
+cameras share the same CPU cores.
+"""
+import threading
+import time
+import cv2
+from .matcher import load_matcher
+from .metrics import METRICS
+from .roi import DetectionRegion
+from .tracker import FaceTracker
+from .voting import TemporalVoter
+
+
+def locate_faces(image, model="hog"):
+    """face_locations as a top-level function so a process pool can run it"""
+    # face_recognition (dlib and its models) is imported on first use, not at startup
+    import face_recognition
+    return face_recognition.face_locations(image, model=model)
+
+
+def encode_faces(image, boxes):
+    """face_encodings as a top-level function so a process pool can run it"""
+    import face_recognition
+    return face_recognition.face_encodings(image, boxes)
+
+
+def warm_up():
+    """Import face_recognition and load dlib's models ahead of the first frame"""
+    import face_recognition
+    return face_recognition
+
+
+class RecognitionEngine:
+    """Everything between a camera frame and a confirmed employee ID"""
+
+    def __init__(self, conf, scale=0.5, zone=None, matcher=None, executor=None):
+        self.conf = conf
+        self.scale = scale
+        # Cameras can share one matcher and one pool of detection/encoding processes
+        self.matcher = matcher if matcher is not None else load_matcher(conf)
+        self.executor = executor
+        self.pending_matcher = None  # set by reload(), installed before the next pass
+        self.swap_lock = threading.Lock()
+
+        # Face tracker carries identities across frames so steady faces are not re-encoded
+        self.tracker = FaceTracker(
+            iou_threshold=conf["track_iou_threshold"],
+            max_missed=conf["track_max_missed"],
+            min_confidence=conf["track_min_confidence"],
+            reverify_seconds=conf["track_reverify_seconds"],
+            vote_window=conf["vote_window"],
+        )
+
+        # Detection only scans the doorway zone, and between full scans only the area
+        # around faces found on the previous pass
+        self.region = DetectionRegion(
+            zone=conf["detection_roi"] if zone is None else zone,
+            scale=scale,
+            padding=conf["roi_padding"],
+            full_scan_every=conf["roi_full_scan_every"],
+        )
+
+        # K-of-M votes per track (with a confidence-weighted early accept) before
+        # attendance is stored
+        self.voter = TemporalVoter(
+            window=conf["vote_window"],
+            min_votes=conf["vote_min"],
+            early_score=conf["vote_early_score"],
+            max_missed=conf["track_max_missed"],
+        )
+
+    def shrink(self, frame):
+        """Resize frame for faster processing"""
+        return cv2.resize(frame, (0, 0), fx=self.scale, fy=self.scale)
+
+    def detect_faces(self, image):
+        with METRICS.timer("detect"):
+            if self.executor is not None:
+                return self.executor.submit(locate_faces, image, self.conf["detection_method"]).result()
+            return locate_faces(image, self.conf["detection_method"])
+
+    def encode(self, image, boxes):
+        METRICS.inc("faces_encoded", len(boxes))
+        with METRICS.timer("encode"):
+            if self.executor is not None:
+                return self.executor.submit(encode_faces, image, boxes).result()
+            return encode_faces(image, boxes)
+
+    def recognize(self, small_frame, now=None):
+        """Detect and identify faces on a downscaled frame
+
+        now is the frame's time in seconds: the footage timestamp for recorded
+        sources, so tracking and reverification follow the footage however fast it
+        is replayed; wall-clock time when None (live cameras).
+        Returns [(box, person, confidence, track_id)] in small-frame coordinates, the
+        seconds spent in each stage and the IDs of the tracks classified on this pass
+        (the others carry their earlier identity forward)."""
+        now = time.time() if now is None else now
+        timings = {"detect": 0.0, "encode": 0.0, "match": 0.0}
+        self.swap_matcher()
+        start = time.perf_counter()
+
+        # Convert to RGB for face_recognition (no grayscale needed)
+        rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+
+        # Detect faces on smaller frame, inside the regions of interest
+        boxes = self.region.detect(rgb_small, self.detect_faces, self.tracker.boxes())
+        tracks = self.tracker.update(boxes, now)
+        timings["detect"] = time.perf_counter() - start
+        METRICS.inc("recognition_passes")
+        METRICS.inc("faces_detected", len(tracks))
+        if len(tracks) == 0:
+            return [], timings, set()
+
+        # Only new, uncertain, still-voting or due-for-reverification faces are encoded, all in one call
+        stale = [track for track in tracks if self.tracker.needs_encoding(track, now)]
+        if stale:
+            start = time.perf_counter()
+            encodings = self.encode(rgb_small, [track.box for track in stale])
+            timings["encode"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            people, confidences = self.matcher.classify(encodings)
+            for track, person, confidence in zip(stale, people, confidences):
+                self.tracker.assign(track, person, float(confidence), now)
+            timings["match"] = time.perf_counter() - start
+            METRICS.observe("match", timings["match"])
+
+        faces = [(track.box, track.person, track.confidence, track.track_id) for track in tracks]
+        return faces, timings, {track.track_id for track in stale}
+
+    def to_frame(self, faces):
+        """Scale face boxes back to original frame size"""
+        inv = 1.0 / self.scale
+        return [((int(top * inv), int(right * inv), int(bottom * inv), int(left * inv)), person, confidence, track_id)
+                for ((top, right, bottom, left), person, confidence, track_id) in faces]
+
+    def confirm(self, faces, classified):
+        """Feed one recognition result; returns the employee IDs confirmed by it
+
+        Each track votes on its own sliding window, so a neighbour entering the
+        frame never resets someone else's confirmation; only the tracks in
+        classified (from recognize) cast a vote. A track stays on the encode path
+        every pass until its identity is confirmed here."""
+        confirmed = self.voter.update(faces, classified)
+        if confirmed:
+            self.tracker.confirm({track_id for (_, person, _, track_id) in faces
+                                  if track_id in classified and person in confirmed})
+        return confirmed
+
+    def reload(self, matcher=None):
+        """Reload the matcher from disk (after new training); raises if it cannot be loaded
+
+        The new matcher takes over at the start of the next recognition pass, so a
+        pass in flight on the worker thread finishes with the model it started with."""
+        matcher = matcher if matcher is not None else load_matcher(self.conf)
+        with self.swap_lock:
+            self.pending_matcher = matcher
+
+    def swap_matcher(self):
+        """Install a matcher handed to reload(); runs between recognition passes"""
+        with self.swap_lock:
+            matcher, self.pending_matcher = self.pending_matcher, None
+        if matcher is not None:
+            self.matcher = matcher
+            # Identities from the previous model must be re-verified
+            self.tracker.reset()
+
+    def reset(self):
+        self.voter.reset()
+        self.tracker.reset()
@@ -0,0 +1,102 @@
+"""
+Face matchers used by recognition
+Every matcher exposes classify(encodings) -> (people, confidences) so the
+recognition loop does not care whether an SVC or a gallery search is behind it
+"""
+import pickle
+import numpy as np
+
+UNKNOWN = "unknown"
+
+
+class SVCMatcher:
+    """The pickled sklearn SVC + LabelEncoder written by train_model.py"""
+
+    def __init__(self, recognizer, le):
+        self.recognizer = recognizer
+        self.le = le
+
+    @classmethod
+    def from_files(cls, recognizer_path, le_path):
+        recognizer = pickle.loads(open(recognizer_path, "rb").read())
+        le = pickle.loads(open(le_path, "rb").read())
+        return cls(recognizer, le)
+
+    def classify(self, encodings):
+        preds = self.recognizer.predict_proba(encodings)
+        best = np.argmax(preds, axis=1)
+        confidences = preds[np.arange(len(best)), best]
+        return self.le.classes_[best], confidences
+
+
+class NearestNeighbourMatcher:
+    """Exact nearest-neighbour search over the 128-d gallery held as one float32 matrix"""
+
+    def __init__(self, encodings, names, tolerance=0.6):
+        self.gallery = np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, 128)
+        self.gallery_sq = np.einsum("ij,ij->i", self.gallery, self.gallery)
+        self.classes_, self.labels = np.unique(np.asarray(names), return_inverse=True)
+        self.tolerance = tolerance
+
+    @classmethod
+    def from_encodings_file(cls, encodings_path, tolerance=0.6):
+        with open(encodings_path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["encodings"], data["names"], tolerance)
+
+    def search(self, encodings, k=1):
+        """Top-k gallery rows for each query: (indices, distances), both shaped (n, k)"""
+        queries = np.asarray(encodings, dtype=np.float32).reshape(-1, 128)
+        k = min(k, len(self.gallery))
+
+        # |q - g|^2 = |q|^2 - 2 q.g + |g|^2, one matrix product for the whole batch
+        dists = self.gallery_sq[np.newaxis, :] - 2.0 * (queries @ self.gallery.T)
+        dists += np.einsum("ij,ij->i", queries, queries)[:, np.newaxis]
+        np.maximum(dists, 0, out=dists)
+
+        if k < len(self.gallery):
+            idx = np.argpartition(dists, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.tile(np.arange(len(self.gallery)), (len(queries), 1))
+        rows = np.arange(len(queries))[:, np.newaxis]
+        order = np.argsort(dists[rows, idx], axis=1)
+        idx = idx[rows, order]
+        return idx, np.sqrt(dists[rows, idx])
+
+    def classify(self, encodings):
+        idx, dists = self.search(encodings, k=1)
+        idx, dists = idx[:, 0], dists[:, 0]
+        people = self.classes_[self.labels[idx]].astype(object)
+
+        # Anything further than the tolerance is nobody we know
+        people[dists > self.tolerance] = UNKNOWN
+        return people, distance_to_confidence(dists, self.tolerance)
+
+
+def distance_to_confidence(dists, tolerance):
+    """Map face distances to [0, 1]; exactly the tolerance maps to 0.5"""
+    dists = np.asarray(dists, dtype=np.float32)
+    inside = 0.5 + 0.5 * (1.0 - dists / tolerance)
+    outside = 0.5 * (1.0 - dists) / (1.0 - tolerance)
+    return np.clip(np.where(dists <= tolerance, inside, outside), 0.0, 1.0)
+
+
+def load_matcher(conf, verify=False):
+    """Build the matcher selected by the "matcher" key in config.json
+
+    verify checks an exported model's checksums and runs a self-test before it is used."""
+    method = conf["matcher"] or "svc"
+    if method == "svc":
+        # The exported artifact needs no sklearn; the pickles remain for models trained before it existed
+        from .model import CompactSVCMatcher, read_manifest
+        model_path = conf["model_path"] or "output/model"
+        manifest = read_manifest(model_path)
+        if manifest is not None:
+            return CompactSVCMatcher.load(model_path, manifest, verify=verify)
+        return SVCMatcher.from_files(conf["recognizer_path"], conf["le_path"])
+    if method == "knn":
+        return NearestNeighbourMatcher.from_encodings_file(conf["encodings_path"], conf["match_tolerance"])
+    if method == "ann":
+        from .ann import IVFIndex
+        return IVFIndex.load(conf["ann_index_path"], nprobe=conf["ann_nprobe"], tolerance=conf["match_tolerance"])
+    raise ValueError(f"Unknown matcher '{method}' (expected 'svc', 'knn' or 'ann')")
@@ -0,0 +1,203 @@
+"""
+Per-stage timing metrics
+Histograms of how long each stage takes (camera read, face detection, encoding,
+matching, the SQLite write, rendering) plus event counters, shown as an
+on-screen overlay, written to a Prometheus text file (node_exporter textfile
+collector) and served on a local HTTP endpoint
+"""
+import bisect
+import collections
+import contextlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Histogram bucket bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative buckets for Prometheus plus a rolling window for percentiles"""
+
+    def __init__(self, buckets=BUCKETS, window=256):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        """q-th percentile (0-100) of the rolling window, in seconds"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100.0))]
+
+
+class Metrics:
+    """Thread-safe registry of stage histograms and counters"""
+
+    def __init__(self, prefix="attendance"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def overlay_text(self):
+        """One line of rolling p50/p95 per stage, in milliseconds"""
+        with self.lock:
+            parts = [f"{stage} {h.percentile(50)*1000:.0f}/{h.percentile(95)*1000:.0f}"
+                     for stage, h in sorted(self.histograms.items())]
+        return "p50/p95 ms: " + " | ".join(parts) if parts else "p50/p95 ms: -"
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        name = f"{self.prefix}_stage_seconds"
+        lines = [f"# HELP {name} Time spent in each pipeline stage.", f"# TYPE {name} histogram"]
+        with self.lock:
+            for stage, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip([str(b) for b in h.buckets] + ["+Inf"], h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+            name = f"{self.prefix}_events_total"
+            lines += [f"# HELP {name} Pipeline event counters.", f"# TYPE {name} counter"]
+            for event, value in sorted(self.counters.items()):
+                lines.append(f'{name}{{event="{event}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+
+# Process-wide registry the pipeline modules record into
+METRICS = Metrics()
+
+
+def textfile_path(path, job=None):
+    """Per-script file next to the main one, e.g. attendance.prom -> attendance_encode_faces.prom"""
+    if job is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{job}{ext or '.prom'}"
+
+
+def write_textfile(path, metrics=METRICS):
+    """Atomically rewrite a Prometheus text file (scrapers never see half a file)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(metrics.render_prometheus())
+    os.replace(tmp_path, path)
+
+
+class TextfileExporter:
+    """Rewrites the metrics file every interval seconds"""
+
+    def __init__(self, path, interval=15.0, metrics=METRICS):
+        self.path = path
+        self.interval = interval
+        self.metrics = metrics
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="TextfileExporter", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            write_textfile(self.path, self.metrics)
+        except OSError as e:
+            print(f"[WARNING] Could not write metrics to {self.path}: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        self.write()
+
+
+class MetricsServer:
+    """GET /metrics on a local port, for Prometheus to scrape"""
+
+    def __init__(self, port, host="127.0.0.1", metrics=METRICS):
+        registry = metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # no access log on the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="MetricsServer", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def start_exporters(conf, job=None, metrics=METRICS):
+    """Start the text file and HTTP exporters enabled in config.json; returns them for stop()"""
+    exporters = []
+    if conf["metrics_textfile"]:
+        path = textfile_path(conf["metrics_textfile"], job)
+        exporters.append(TextfileExporter(path, conf["metrics_interval"] or 15.0, metrics).start())
+    if conf["metrics_port"]:
+        try:
+            exporters.append(MetricsServer(conf["metrics_port"], conf["metrics_host"] or "127.0.0.1",
+                                           metrics).start())
+            print(f"[INFO] Metrics on http://{conf['metrics_host'] or '127.0.0.1'}:{conf['metrics_port']}/metrics")
+        except OSError as e:
+            print(f"[WARNING] Could not start the metrics endpoint: {e}")
+    return exporters
@@ -0,0 +1,240 @@
+"""
+Compact model artifact
+The trained SVC exported as plain .npy arrays (weights, biases, Platt scaling,
+class IDs and the gallery encodings) that load with np.load(mmap_mode="r"), so
+the kiosk classifies with NumPy alone, never imports sklearn, and processes on
+the same machine share the model's pages. Each export goes to its own version
+directory; manifest.json names the current one and is replaced last, so a
+reader never sees a half-written model.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+MODEL_FORMAT = 1
+MANIFEST = "manifest.json"
+ARRAYS = ["coef", "intercept", "prob_a", "prob_b", "classes", "gallery", "gallery_labels"]
+KEEP_VERSIONS = 3  # older version directories are pruned after an export
+MIN_PROB = 1e-7  # libsvm clips the pairwise probabilities to [MIN_PROB, 1 - MIN_PROB]
+
+
+def file_sha256(path, chunk=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_manifest(model_path):
+    """The current manifest of the artifact at model_path, or None when there is none"""
+    try:
+        with open(os.path.join(model_path, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def export_model(conf, recognizer, le, encodings, names):
+    """Write the fitted linear SVC + LabelEncoder as a new version under model_path"""
+    model_path = conf["model_path"] or "output/model"
+    if recognizer.kernel != "linear" or not recognizer.probability:
+        raise ValueError("Only a linear SVC trained with probability=True can be exported")
+
+    # libsvm's ovo decision values: sklearn flips the sign for two classes
+    coef = np.asarray(recognizer.coef_, dtype=np.float64)
+    intercept = np.asarray(recognizer.intercept_, dtype=np.float64)
+    if len(recognizer.classes_) == 2:
+        coef, intercept = -coef, -intercept
+
+    # The recognizer is trained on LabelEncoder indices; store the names directly
+    classes = np.asarray(le.inverse_transform(recognizer.classes_)).astype(str)
+    gallery_classes, gallery_labels = np.unique(np.asarray(names).astype(str), return_inverse=True)
+    arrays = {
+        "coef": np.ascontiguousarray(coef),
+        "intercept": intercept,
+        "prob_a": np.asarray(recognizer.probA_, dtype=np.float64),
+        "prob_b": np.asarray(recognizer.probB_, dtype=np.float64),
+        "classes": classes,
+        "gallery": np.ascontiguousarray(encodings, dtype=np.float32).reshape(-1, 128),
+        # Gallery rows are labelled with indices into classes (every name is a class)
+        "gallery_labels": np.searchsorted(classes, gallery_classes)[gallery_labels].astype(np.int64),
+    }
+
+    # Versions only ever increase, so a directory name is never reused for different files
+    os.makedirs(model_path, exist_ok=True)
+    current = read_manifest(model_path)
+    version = max([current["version"] if current else 0] + list_versions(model_path)) + 1
+    directory = os.path.join(model_path, f"v{version:06d}")
+    os.makedirs(directory)
+
+    files = {}
+    for name, array in arrays.items():
+        path = os.path.join(directory, name + ".npy")
+        np.save(path, array, allow_pickle=False)
+        files[name] = {"sha256": file_sha256(path), "dtype": array.dtype.str, "shape": list(array.shape)}
+
+    manifest = {
+        "format": MODEL_FORMAT,
+        "version": version,
+        "directory": os.path.basename(directory),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "n_classes": len(classes),
+        "n_encodings": len(arrays["gallery"]),
+        "files": files,
+    }
+    tmp_path = os.path.join(model_path, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(model_path, MANIFEST))
+
+    prune_versions(model_path, manifest["directory"])
+    return manifest
+
+
+def list_versions(model_path):
+    return sorted(int(d[1:]) for d in os.listdir(model_path)
+                  if d.startswith("v") and d[1:].isdigit() and os.path.isdir(os.path.join(model_path, d)))
+
+
+def prune_versions(model_path, current, keep=KEEP_VERSIONS):
+    """Delete all but the newest keep version directories (never the current one)"""
+    for version in list_versions(model_path)[:-keep]:
+        directory = f"v{version:06d}"
+        if directory != current:
+            # A reader may still map the old files; on Windows that makes them undeletable
+            shutil.rmtree(os.path.join(model_path, directory), ignore_errors=True)
+
+
+def verify_model(model_path, manifest):
+    """Raise ValueError unless every file of the version matches the manifest's checksum, dtype and shape"""
+    directory = os.path.join(model_path, manifest["directory"])
+    for name in ARRAYS:
+        expected = manifest["files"][name]
+        path = os.path.join(directory, name + ".npy")
+        if file_sha256(path) != expected["sha256"]:
+            raise ValueError(f"Checksum mismatch for {path}")
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+        if array.dtype.str != expected["dtype"] or list(array.shape) != expected["shape"]:
+            raise ValueError(f"{path} is {array.dtype.str} {list(array.shape)}, "
+                             f"the manifest says {expected['dtype']} {expected['shape']}")
+
+
+class CompactSVCMatcher:
+    """Linear one-vs-one SVC with libsvm's probability estimates, in NumPy"""
+
+    def __init__(self, coef, intercept, prob_a, prob_b, classes, gallery=None, gallery_labels=None,
+                 version=None):
+        self.coef = coef  # (n_pairs, 128), pairs (0,1), (0,2), ..., (1,2), ...
+        self.intercept = intercept
+        self.prob_a = prob_a
+        self.prob_b = prob_b
+        self.classes_ = classes
+        self.gallery = gallery
+        self.gallery_labels = gallery_labels
+        self.version = version
+        k = len(classes)
+        self.pair_i, self.pair_j = np.triu_indices(k, 1)
+
+    @classmethod
+    def load(cls, model_path, manifest=None, verify=False):
+        """Memory-map the version named by the manifest; verify checks it end to end first"""
+        manifest = manifest or read_manifest(model_path)
+        if manifest is None:
+            raise FileNotFoundError(f"No {MANIFEST} in {model_path}")
+        if manifest["format"] != MODEL_FORMAT:
+            raise ValueError(f"Unsupported model format {manifest['format']} in {model_path}")
+
+        if verify:
+            verify_model(model_path, manifest)
+
+        directory = os.path.join(model_path, manifest["directory"])
+        arrays = {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r", allow_pickle=False)
+                  for name in ARRAYS}
+        # Tiny and read on every call; the names are needed as an array of str
+        for name in ("intercept", "prob_a", "prob_b", "classes"):
+            arrays[name] = np.array(arrays[name])
+        matcher = cls(version=manifest["version"], **arrays)
+        if verify:
+            matcher.self_test()
+        return matcher
+
+    def self_test(self, n=8):
+        """Classify a few gallery encodings; raises ValueError if the model is inconsistent"""
+        k = len(self.classes_)
+        if self.coef.shape[0] != k * (k - 1) // 2 or len(self.intercept) != self.coef.shape[0]:
+            raise ValueError(f"{k} classes need {k * (k - 1) // 2} pairwise classifiers, got {self.coef.shape[0]}")
+        if self.gallery is None or len(self.gallery) == 0:
+            return
+        preds = self.predict_proba(self.gallery[:n])
+        if not np.all(np.isfinite(preds)) or not np.allclose(preds.sum(axis=1), 1.0, atol=1e-3):
+            raise ValueError("Model produced invalid probabilities")
+
+    def decision_function(self, encodings):
+        """One-vs-one decision values, (n, n_pairs); positive favours the first class of the pair"""
+        X = np.asarray(encodings, dtype=np.float64).reshape(-1, self.coef.shape[1])
+        return X @ self.coef.T + self.intercept
+
+    def predict_proba(self, encodings):
+        """Same estimates as SVC(probability=True).predict_proba"""
+        dec = self.decision_function(encodings)
+
+        # Platt scaling of every pair, written to avoid overflow like libsvm's sigmoid_predict
+        fApB = dec * self.prob_a + self.prob_b
+        e = np.exp(-np.abs(fApB))
+        r = np.where(fApB >= 0, e / (1.0 + e), 1.0 / (1.0 + e))
+        r = np.clip(r, MIN_PROB, 1.0 - MIN_PROB)
+
+        # r_ij = P(class i | i or j); r_ji = 1 - r_ij
+        k = len(self.classes_)
+        pairwise = np.zeros((len(dec), k, k))
+        pairwise[:, self.pair_i, self.pair_j] = r
+        pairwise[:, self.pair_j, self.pair_i] = 1.0 - r
+        return multiclass_probability(pairwise)
+
+    def classify(self, encodings):
+        preds = self.predict_proba(encodings)
+        best = np.argmax(preds, axis=1)
+        confidences = preds[np.arange(len(best)), best]
+        return self.classes_[best], confidences
+
+
+def multiclass_probability(r):
+    """libsvm's pairwise coupling (Wu, Lin and Weng, method 2), for a batch of (k, k) matrices"""
+    n, k, _ = r.shape
+    # Q[t][t] = sum_{j != t} r_jt^2, Q[t][j] = -r_jt * r_tj
+    Q = -np.swapaxes(r, 1, 2) * r
+    diag = np.einsum("nij,nij->nj", r, r) - np.einsum("nii->ni", r) ** 2
+    Q[:, np.arange(k), np.arange(k)] = diag
+
+    p = np.full((n, k), 1.0 / k)
+    eps = 0.005 / k
+    active = np.ones(n, dtype=bool)
+    for _ in range(max(100, k)):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        Qa, pa = Q[idx], p[idx]
+        Qp = np.einsum("nij,nj->ni", Qa, pa)
+        pQp = np.einsum("ni,ni->n", pa, Qp)
+        done = np.max(np.abs(Qp - pQp[:, np.newaxis]), axis=1) < eps
+        active[idx[done]] = False
+        keep = ~done
+        if not keep.any():
+            break
+        idx, Qa, pa, Qp, pQp = idx[keep], Qa[keep], pa[keep], Qp[keep], pQp[keep]
+
+        # One sweep of coordinate updates; each depends on the previous one
+        for t in range(k):
+            Qtt = Qa[:, t, t]
+            diff = (-Qp[:, t] + pQp) / Qtt
+            pa[:, t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Qtt + 2.0 * Qp[:, t])) / scale ** 2
+            Qp = (Qp + diff[:, np.newaxis] * Qa[:, t, :]) / scale[:, np.newaxis]
+            pa /= scale[:, np.newaxis]
+        p[idx] = pa
+    return p
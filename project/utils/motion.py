@@ -0,0 +1,40 @@
+"""
+Motion gate for idle kiosks
+Compares a tiny grayscale thumbnail of each frame with a slowly adapting
+background model; face detection only needs to run when something changed
+"""
+import cv2
+import numpy as np
+
+
+class MotionDetector:
+    """Frame differencing against a running-average background on a thumbnail"""
+
+    def __init__(self, threshold=25, min_area=0.01, learning_rate=0.05, size=(64, 48)):
+        self.threshold = threshold  # per-pixel grey-level change that counts
+        self.min_area = min_area  # fraction of changed pixels that counts as motion
+        self.learning_rate = learning_rate
+        self.size = size
+        self.background = None
+        self.changed = 0.0  # fraction of changed pixels in the last frame
+
+    def update(self, frame):
+        """Feed one BGR frame; returns True when the scene changed"""
+        thumb = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (3, 3), 0)
+
+        if self.background is None:
+            self.background = gray.astype(np.float32)
+            self.changed = 1.0
+            return True
+
+        diff = cv2.absdiff(gray, cv2.convertScaleAbs(self.background))
+        self.changed = np.count_nonzero(diff > self.threshold) / float(diff.size)
+
+        # Lighting drifts and people who stand still fade into the background
+        cv2.accumulateWeighted(gray, self.background, self.learning_rate)
+        return self.changed >= self.min_area
+
+    def reset(self):
+        self.background = None
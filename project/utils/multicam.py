@@ -0,0 +1,140 @@
+"""
+Multi-camera recognition
+One CameraChannel per entrance: its own capture thread, tracker, motion gate
+and stats, with detection/encoding sent to a process pool shared by every
+camera. Each channel has at most one frame in the pool at a time, so the
+pool's FIFO queue serves the cameras round-robin and a busy door cannot
+starve the others. Recorded sources (live = False) are read frame by frame
+instead of through a capture thread, so replays never drop frames.
+"""
+import collections
+import threading
+import time
+from .pipeline import FrameGrabber
+
+
+class CameraChannel:
+    """Capture + recognition loop for one camera"""
+
+    def __init__(self, name, stream, engine, motion=None, on_result=None, window=100):
+        self.name = name
+        self.stream = stream
+        self.engine = engine
+        self.motion = motion
+        # called as on_result(channel, faces, classified, position) on this channel's thread; position
+        # is the frame's timestamp in recorded footage and None for live sources
+        self.on_result = on_result
+        self.live = getattr(stream, "live", True)
+        self.grabber = FrameGrabber(stream, name=name) if self.live else None
+        self.last_faces = []
+
+        # Stage statistics, reset by stats()
+        self.lock = threading.Lock()
+        self.processed = 0
+        self.skipped = 0  # frames skipped because nothing moved
+        self.errors = 0
+        self.stage_totals = {"detect": 0.0, "encode": 0.0, "match": 0.0}
+        self.latencies = collections.deque(maxlen=window)
+        self.window_start = time.time()
+
+        self.stopped = threading.Event()
+        self.finished = threading.Event()  # a recorded source reached its end
+        self.thread = threading.Thread(target=self._run, name=f"CameraChannel-{name}", daemon=True)
+
+    def start(self):
+        if self.grabber is not None:
+            self.grabber.start()
+        self.thread.start()
+        return self
+
+    def _next_frame(self, last_frame_id):
+        """Return (frame_id, frame), or (last_frame_id, None) when nothing new is available"""
+        if self.grabber is not None:
+            frame_id, frame = self.grabber.read()
+            if frame is None or frame_id == last_frame_id:
+                # No new frame from the camera yet
+                time.sleep(0.005)
+                return last_frame_id, None
+            return frame_id, frame
+
+        ret, frame = self.stream.read()
+        if not ret:
+            if getattr(self.stream, "ended", False):
+                self.finished.set()
+            return last_frame_id, None
+        return last_frame_id + 1, frame
+
+    def _run(self):
+        last_frame_id = 0
+        while not self.stopped.is_set() and not self.finished.is_set():
+            last_frame_id, frame = self._next_frame(last_frame_id)
+            if frame is None:
+                continue
+            position = None if self.live else self.stream.position
+
+            # Nothing moved and no one is being tracked: no need to look for faces
+            moving = self.motion.update(frame) if self.motion else True
+            if not moving and not self.last_faces:
+                with self.lock:
+                    self.skipped += 1
+                continue
+
+            start = time.time()
+            try:
+                faces, timings, classified = self.engine.recognize(self.engine.shrink(frame), position)
+            except Exception as e:
+                with self.lock:
+                    self.errors += 1
+                print(f"[ERROR] {self.name} recognition failed: {e}")
+                time.sleep(0.1)
+                continue
+            latency = time.time() - start
+            self.last_faces = faces
+
+            with self.lock:
+                self.processed += 1
+                self.latencies.append(latency)
+                for stage, seconds in timings.items():
+                    self.stage_totals[stage] += seconds
+
+            if self.on_result is not None:
+                self.on_result(self, faces, classified, position)
+
+    def stats(self, reset=True):
+        """FPS, latency and drop counts since the previous call"""
+        now = time.time()
+        if self.grabber is not None:
+            cap = self.grabber.stats()
+        else:
+            cap = {"dropped": getattr(self.stream, "frames_dropped", 0), "failures": 0}
+        with self.lock:
+            elapsed = max(now - self.window_start, 1e-6)
+            latencies = sorted(self.latencies)
+            result = {
+                "camera": self.name,
+                "processed_fps": round(self.processed / elapsed, 2),
+                "frames_processed": self.processed,
+                "frames_skipped": self.skipped,
+                "errors": self.errors,
+                "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else 0.0,
+                "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else 0.0,
+                "capture_dropped": cap["dropped"],
+                "capture_failures": cap["failures"],
+            }
+            for stage, total in self.stage_totals.items():
+                result[f"{stage}_ms"] = round(total / self.processed * 1000, 1) if self.processed else 0.0
+
+            if reset:
+                self.processed = self.skipped = self.errors = 0
+                self.stage_totals = dict.fromkeys(self.stage_totals, 0.0)
+                self.latencies.clear()
+                self.window_start = now
+        return result
+
+    def stop(self, timeout=2.0):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+        if self.grabber is not None:
+            self.grabber.stop()
+        self.stream.release()
@@ -0,0 +1,173 @@
+"""
+Threaded capture / recognition pipeline
+Keeps camera reads and face recognition off the Tkinter main loop
+"""
+import queue
+import threading
+import time
+from .metrics import METRICS
+
+
+class FrameGrabber:
+    """Capture thread that always holds the newest frame from a video stream"""
+
+    def __init__(self, stream, name="capture"):
+        self.stream = stream
+        self.name = name
+        self.lock = threading.Lock()
+        self.frame = None
+        self.frame_id = 0
+        self.last_read_id = 0
+
+        # Stage statistics
+        self.frames_captured = 0
+        self.frames_dropped = 0  # frames replaced before anyone read them
+        self.read_failures = 0
+
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"FrameGrabber-{name}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        failing = False
+        while not self.stopped.is_set():
+            with METRICS.timer("capture"):
+                ret, frame = self.stream.read()
+            if not ret:
+                self.read_failures += 1
+                METRICS.inc("capture_failures")
+                if not failing:
+                    print(f"[WARNING] Failed to grab frame from {self.name}")
+                    failing = True
+                time.sleep(0.05)
+                continue
+            failing = False
+
+            with self.lock:
+                # The previous frame was never picked up by the consumer
+                if self.frame_id > self.last_read_id:
+                    self.frames_dropped += 1
+                    METRICS.inc("frames_dropped")
+                self.frame = frame
+                self.frame_id += 1
+                self.frames_captured += 1
+            METRICS.inc("frames_captured")
+
+    def read(self):
+        """Return (frame_id, frame) for the newest frame, or (0, None) before the first one"""
+        with self.lock:
+            self.last_read_id = self.frame_id
+            return self.frame_id, self.frame
+
+    def stats(self):
+        with self.lock:
+            return {
+                "depth": 1 if self.frame_id > self.last_read_id else 0,
+                "captured": self.frames_captured,
+                "dropped": self.frames_dropped,
+                "failures": self.read_failures,
+            }
+
+    def stop(self, timeout=1.0):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+
+class RecognitionWorker:
+    """Background thread that runs process_fn on frames taken from a bounded queue"""
+
+    def __init__(self, process_fn, max_queue_size=1, name="recognition"):
+        self.process_fn = process_fn
+        self.name = name
+        self.jobs = queue.Queue(maxsize=max_queue_size)
+        self.results = queue.Queue()
+        self.busy = False
+
+        # Stage statistics
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0  # stale frames pushed out of the queue by newer ones
+        self.errors = 0
+        self.last_duration = 0.0
+        self.last_latency = 0.0
+
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"RecognitionWorker-{name}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def submit(self, frame_id, frame):
+        """Queue a frame; when the queue is full the oldest pending frame is dropped"""
+        job = (frame_id, frame, time.time())
+        while True:
+            try:
+                self.jobs.put_nowait(job)
+                self.submitted += 1
+                return
+            except queue.Full:
+                try:
+                    self.jobs.get_nowait()
+                    self.dropped += 1
+                    METRICS.inc("recognition_dropped")
+                except queue.Empty:
+                    pass
+
+    def pending(self):
+        """Number of frames queued or currently being processed"""
+        return self.jobs.qsize() + (1 if self.busy else 0)
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                frame_id, frame, submitted_at = self.jobs.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            self.busy = True
+            start = time.time()
+            try:
+                result = self.process_fn(frame)
+            except Exception as e:
+                self.errors += 1
+                METRICS.inc("recognition_errors")
+                print(f"[ERROR] {self.name} worker failed: {e}")
+                continue
+            finally:
+                self.busy = False
+
+            finished = time.time()
+            self.last_duration = finished - start
+            self.last_latency = finished - submitted_at
+            self.processed += 1
+            self.results.put((frame_id, result))
+
+    def poll(self):
+        """Return every (frame_id, result) finished since the last call, oldest first"""
+        finished = []
+        while True:
+            try:
+                finished.append(self.results.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def stats(self):
+        return {
+            "depth": self.jobs.qsize(),
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "duration": self.last_duration,
+            "latency": self.last_latency,
+        }
+
+    def stop(self, timeout=2.0):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
@@ -0,0 +1,55 @@
+"""
+Render path for the Tk video canvas
+One canvas image item and one PhotoImage are reused for every frame, and the
+resize / colour conversion write into preallocated buffers
+"""
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+from .metrics import METRICS
+
+
+class CanvasRenderer:
+    """Draws BGR frames onto a Tk canvas without creating a new item per frame"""
+
+    def __init__(self, canvas, interpolation=cv2.INTER_LINEAR):
+        self.canvas = canvas
+        self.interpolation = interpolation
+        self.size = None
+        self.item = None
+        self.photo = None
+        self.resized = None  # BGR frame scaled to the canvas
+        self.rgba = None  # the same frame converted for Tk
+        self.buffer_image = None  # PIL view over self.rgba (no copy)
+        self.frames_rendered = 0
+
+    def _allocate(self, width, height):
+        """(Re)build buffers and the PhotoImage; only happens when the canvas is resized"""
+        self.size = (width, height)
+        self.resized = np.empty((height, width, 3), dtype=np.uint8)
+        # PIL only maps (rather than copies) 4-channel buffers, hence RGBA
+        self.rgba = np.empty((height, width, 4), dtype=np.uint8)
+        self.buffer_image = Image.frombuffer("RGBA", (width, height), self.rgba, "raw", "RGBA", 0, 1)
+        self.photo = ImageTk.PhotoImage("RGBA", (width, height))
+
+        if self.item is None:
+            self.item = self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+        else:
+            self.canvas.itemconfig(self.item, image=self.photo)
+        self.canvas.tag_lower(self.item)
+
+    def render(self, frame):
+        """Scale a BGR frame to the canvas and show it"""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return False
+        if self.size != (width, height):
+            self._allocate(width, height)
+
+        with METRICS.timer("render"):
+            cv2.resize(frame, (width, height), dst=self.resized, interpolation=self.interpolation)
+            cv2.cvtColor(self.resized, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+            self.photo.paste(self.buffer_image)
+        self.frames_rendered += 1
+        return True
@@ -0,0 +1,110 @@
+"""
+Region-of-interest detection
+Limits the HOG scan to a configurable doorway zone and, between full scans,
+to padded crops around the faces found on the previous pass
+"""
+import cv2
+import numpy as np
+from .tracker import box_iou
+
+
+def parse_zone(zone, scale=1.0):
+    """Config zone -> polygon points scaled to the detection frame
+
+    Accepts a rectangle [x, y, w, h] or a polygon [[x, y], [x, y], ...] in
+    full-frame pixels; returns None when no zone is configured."""
+    if not zone:
+        return None
+    if len(zone) == 4 and not isinstance(zone[0], (list, tuple)):
+        x, y, w, h = zone
+        zone = [[x, y], [x + w, y], [x + w, y + h], [x, y + h]]
+    return np.round(np.array(zone, dtype=np.float32) * scale).astype(np.int32)
+
+
+def suppress_duplicates(boxes, iou_threshold=0.5):
+    """Drop boxes that overlap an earlier one (the same face seen by two crops)"""
+    kept = []
+    for box in boxes:
+        if all(box_iou(box, other) < iou_threshold for other in kept):
+            kept.append(box)
+    return kept
+
+
+class DetectionRegion:
+    """Decides which pixels of a frame the face detector scans"""
+
+    def __init__(self, zone=None, scale=1.0, padding=0.5, full_scan_every=5):
+        self.polygon = parse_zone(zone, scale)
+        self.padding = padding  # crop margin around a previous box, as a fraction of its size
+        self.full_scan_every = max(1, full_scan_every)
+        self.mask = None
+        self.mask_shape = None
+        self.bounds = None  # (top, right, bottom, left) of the zone in the frame
+        self.passes = 0
+
+        # Statistics for the overlay
+        self.last_mode = "full"
+        self.last_scanned = 0.0  # fraction of the frame's pixels scanned
+
+    def _prepare(self, shape):
+        """Build the zone mask and bounding rectangle for this frame size (once)"""
+        height, width = shape[:2]
+        if self.mask_shape == (height, width):
+            return
+        self.mask_shape = (height, width)
+        if self.polygon is None:
+            self.mask = None
+            self.bounds = (0, width, height, 0)
+            return
+
+        x, y, w, h = cv2.boundingRect(self.polygon)
+        self.bounds = (max(0, y), min(width, x + w), min(height, y + h), max(0, x))
+
+        # Rectangles need no mask: cropping to the bounds already excludes everything else
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [self.polygon], 255)
+        top, right, bottom, left = self.bounds
+        self.mask = None if cv2.countNonZero(mask) == (bottom - top) * (right - left) else mask
+
+    def _padded(self, box):
+        """Previous face box grown by the padding and clipped to the zone"""
+        top, right, bottom, left = box
+        pad_y = int((bottom - top) * self.padding)
+        pad_x = int((right - left) * self.padding)
+        z_top, z_right, z_bottom, z_left = self.bounds
+        return (max(z_top, top - pad_y), min(z_right, right + pad_x),
+                min(z_bottom, bottom + pad_y), max(z_left, left - pad_x))
+
+    def detect(self, image, detect_fn, previous_boxes=()):
+        """Run detect_fn on the regions of interest; boxes come back in frame coordinates"""
+        self._prepare(image.shape)
+        self.passes += 1
+
+        if previous_boxes and self.passes % self.full_scan_every:
+            regions = [self._padded(box) for box in previous_boxes]
+            self.last_mode = "roi"
+        else:
+            regions = [self.bounds]
+            self.last_mode = "full"
+
+        boxes = []
+        scanned = 0
+        for (top, right, bottom, left) in regions:
+            if bottom <= top or right <= left:
+                continue
+            crop = image[top:bottom, left:right]
+            if self.mask is not None:
+                crop = cv2.bitwise_and(crop, crop, mask=self.mask[top:bottom, left:right])
+            scanned += (bottom - top) * (right - left)
+
+            for (t, r, b, l) in detect_fn(crop):
+                boxes.append((t + top, r + left, b + top, l + left))
+
+        self.last_scanned = scanned / float(image.shape[0] * image.shape[1])
+        return suppress_duplicates(boxes) if len(regions) > 1 else boxes
+
+    def draw(self, frame, scale=1.0, color=(255, 255, 0)):
+        """Outline the doorway zone on a display frame"""
+        if self.polygon is not None:
+            points = np.round(self.polygon / scale).astype(np.int32)
+            cv2.polylines(frame, [points], True, color, 1)
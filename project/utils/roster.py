@@ -0,0 +1,33 @@
+"""
+Employee roster
+Employee ID -> name, read from the TinyDB enrollment database
+"""
+import json
+
+
+def roster_from_records(records):
+    """{employee_id: name} from the student table's documents"""
+    roster = {}
+    for record in records:
+        for student_id, details in record.items():
+            roster[student_id] = details[0] if isinstance(details, list) else details
+    return roster
+
+
+def load_roster(db_path):
+    """Return {employee_id: name} for everyone in the student table"""
+    from tinydb import TinyDB
+    db = TinyDB(db_path)
+    try:
+        return roster_from_records(db.table("student").all())
+    finally:
+        db.close()
+
+
+def read_roster(db_path):
+    """load_roster without TinyDB: parses the JSON file read-only
+
+    Raises ValueError while TinyDB is halfway through rewriting the file."""
+    with open(db_path, encoding="utf-8") as f:
+        document = json.load(f)
+    return roster_from_records(document.get("student", {}).values())
@@ -0,0 +1,123 @@
+"""
+Adaptive frame-skip scheduler
+Decides which camera frames are sent to recognition, based on how long the
+detection + encoding passes actually take on this machine
+"""
+import math
+import time
+
+
+class RateMeter:
+    """Smoothed events-per-second from a running counter"""
+
+    def __init__(self, smoothing=0.3):
+        self.smoothing = smoothing
+        self.rate = 0.0
+        self.last_count = None
+        self.last_time = None
+
+    def update(self, count, now=None):
+        now = time.time() if now is None else now
+        if self.last_time is not None and now - self.last_time >= 0.5:
+            rate = (count - self.last_count) / (now - self.last_time)
+            self.rate = rate if self.rate == 0 else self.rate + self.smoothing * (rate - self.rate)
+            self.last_count, self.last_time = count, now
+        elif self.last_time is None:
+            self.last_count, self.last_time = count, now
+        return self.rate
+
+
+class AdaptiveScheduler:
+    """Runs recognition every Nth frame, with N tuned to the measured stage times"""
+
+    def __init__(self, target_fps=30, max_latency=0.5, idle_after=10.0, idle_interval=1.0,
+                 min_n=1, max_n=30, smoothing=0.2):
+        self.target_fps = target_fps
+        self.max_latency = max_latency
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        self.min_n = min_n
+        self.max_n = max_n
+        self.smoothing = smoothing
+
+        self.n = min_n
+        self.backoff = 0  # extra frames skipped while the display is below target
+        self.stage_times = {}  # stage -> smoothed seconds
+        self.pass_time = 0.0
+        self.display_fps = 0.0
+        self.source_fps = 0.0
+        self.idle = False
+
+        now = time.time()
+        self.frames_since_submit = 0
+        self.last_submit = 0.0
+        self.last_face = now
+        self.last_adjust = now
+
+    def should_process(self, now=None):
+        """Call once per new frame; True when this frame should go to recognition"""
+        now = time.time() if now is None else now
+        self.frames_since_submit += 1
+        self.idle = now - self.last_face >= self.idle_after
+
+        if self.idle:
+            # Nobody around: a slow heartbeat is enough to notice the next arrival
+            due = now - self.last_submit >= self.idle_interval
+        else:
+            due = self.frames_since_submit >= self.n
+
+        if due:
+            self.frames_since_submit = 0
+            self.last_submit = now
+        return due
+
+    def note_activity(self, now=None):
+        """Something happened in front of the camera (e.g. motion); leave idle mode"""
+        self.last_face = time.time() if now is None else now
+        self.idle = False
+
+    def record(self, stage_times, faces_found, now=None):
+        """Feed back one finished recognition pass"""
+        now = time.time() if now is None else now
+        for stage, seconds in stage_times.items():
+            previous = self.stage_times.get(stage)
+            self.stage_times[stage] = seconds if previous is None else previous + self.smoothing * (seconds - previous)
+        self.pass_time = sum(self.stage_times.values())
+        if faces_found:
+            self.last_face = now
+        self._update_n()
+
+    def update_rates(self, display_fps, source_fps, now=None):
+        """Nudge the backoff once a second if the display is missing its target"""
+        now = time.time() if now is None else now
+        self.display_fps = display_fps
+        self.source_fps = source_fps
+        if now - self.last_adjust < 1.0:
+            return
+        self.last_adjust = now
+
+        # The display can never beat the camera, so aim for whichever is lower
+        target = min(self.target_fps, source_fps) if source_fps > 0 else self.target_fps
+        if display_fps < 0.9 * target:
+            self.backoff += 1
+        elif display_fps >= 0.97 * target and self.backoff > 0:
+            self.backoff -= 1
+        self._update_n()
+
+    def _update_n(self):
+        frame_interval = 1.0 / self.target_fps
+
+        # Submitting more often than a pass takes would only drop frames in the queue
+        n_cpu = max(1, math.ceil(self.pass_time / frame_interval))
+
+        # Waiting longer than this between passes would exceed the latency budget
+        n_latency = max(1, int((self.max_latency - self.pass_time) / frame_interval))
+
+        n = min(n_cpu + self.backoff, max(n_latency, n_cpu))
+        self.n = max(self.min_n, min(self.max_n, n))
+        self.backoff = min(self.backoff, self.max_n)
+
+    def overlay_text(self):
+        stages = " ".join(f"{stage} {seconds*1000:.0f}ms" for stage, seconds in self.stage_times.items())
+        mode = "idle" if self.idle else f"N={self.n}"
+        return f"{mode} | {stages} | disp {self.display_fps:.1f}fps cam {self.source_fps:.1f}fps"
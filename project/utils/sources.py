@@ -0,0 +1,226 @@
+"""
+Frame sources
+Cameras, network streams (RTSP/MJPEG/HTTP), video files and image sequences
+behind one read() interface. Live sources are read by a FrameGrabber that
+keeps only the newest frame; recorded sources are read frame by frame by
+the consumer and can be replayed as fast as possible or at their original
+timestamps.
+"""
+import abc
+import glob
+import os
+import time
+import cv2
+from .camera import open_camera, open_device
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+REPLAY_MODES = ("fast", "realtime")
+
+
+class CaptureSource:
+    """A camera or network stream; frames arrive on their own clock"""
+
+    live = True
+
+    def __init__(self, capture, name="camera", url=None, reconnect_delay=2.0):
+        self.capture = capture
+        self.name = name
+        self.url = url  # network streams are reopened when they drop
+        self.reconnect_delay = reconnect_delay
+        self.ended = False
+        self.position = None
+        self.reconnects = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def set(self, prop, value):
+        return self.capture.set(prop, value)
+
+    def read(self):
+        ret, frame = self.capture.read()
+        if not ret and self.url is not None:
+            self._reconnect()
+        return ret, frame
+
+    def _reconnect(self):
+        print(f"[WARNING] Lost stream {self.name}; reconnecting in {self.reconnect_delay}s")
+        self.capture.release()
+        time.sleep(self.reconnect_delay)
+        self.capture = cv2.VideoCapture(self.url)
+        self.reconnects += 1
+
+    def release(self):
+        self.capture.release()
+
+
+class ReplaySource(abc.ABC):
+    """Base for recorded footage: frames carry timestamps (seconds from the start)
+
+    "fast" returns every frame as soon as it is asked for; "realtime" sleeps
+    until each frame's original time and skips frames the consumer was too
+    slow for, like a live camera would."""
+
+    live = False
+
+    def __init__(self, name, replay="fast"):
+        if replay not in REPLAY_MODES:
+            raise ValueError(f"replay must be one of {REPLAY_MODES}, not {replay!r}")
+        self.name = name
+        self.replay = replay
+        self.ended = False
+        self.position = 0.0  # timestamp of the last frame returned
+        self.frames_read = 0
+        self.frames_dropped = 0  # realtime frames skipped to keep up
+        self.clock_start = None
+
+    def set(self, prop, value):
+        return False  # recorded footage cannot be reconfigured
+
+    @abc.abstractmethod
+    def _next(self):
+        """Return (ok, timestamp, frame) for the next frame"""
+
+    def _skip(self):
+        """Advance one frame without decoding it; returns its timestamp or None at the end"""
+        ok, timestamp, _ = self._next()
+        return timestamp if ok else None
+
+    @abc.abstractmethod
+    def _peek_time(self):
+        """Timestamp of the frame the next _next() call returns, or None at the end"""
+
+    def read(self):
+        if self.ended:
+            return False, None
+
+        if self.replay == "realtime":
+            if self.clock_start is None:
+                self.clock_start = time.time() - self._peek_time()
+            # Skip frames whose time has already passed (keep the newest one due)
+            while True:
+                upcoming = self._peek_time()
+                if upcoming is None or upcoming + self.interval() > time.time() - self.clock_start:
+                    break
+                if self._skip() is None:
+                    break
+                self.frames_dropped += 1
+
+        ok, timestamp, frame = self._next()
+        if not ok:
+            self.ended = True
+            return False, None
+
+        if self.replay == "realtime":
+            delay = self.clock_start + timestamp - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        self.position = timestamp
+        self.frames_read += 1
+        return True, frame
+
+    @abc.abstractmethod
+    def interval(self):
+        """Seconds between frames"""
+
+
+class VideoFileSource(ReplaySource):
+    """A recorded video file, timestamps from the container"""
+
+    def __init__(self, path, replay="fast"):
+        super().__init__(os.path.basename(path), replay)
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.index = 0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def interval(self):
+        return 1.0 / self.fps
+
+    def _frame_time(self):
+        # After a read the container reports the decoded frame's timestamp;
+        # fall back to the frame rate when it does not
+        msec = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+        return msec / 1000.0 if msec and msec > 0 else self.index / self.fps
+
+    def _peek_time(self):
+        return self.index / self.fps
+
+    def _next(self):
+        ret, frame = self.capture.read()
+        timestamp = self._frame_time() if ret else None
+        self.index += 1
+        return ret, timestamp, frame
+
+    def _skip(self):
+        if not self.capture.grab():
+            return None
+        timestamp = self._frame_time()
+        self.index += 1
+        return timestamp
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageSequenceSource(ReplaySource):
+    """A directory or glob of still images, played back at a fixed rate"""
+
+    def __init__(self, pattern, replay="fast", fps=30.0):
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, f) for f in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS))
+        super().__init__(os.path.basename(pattern.rstrip("/\\")) or pattern, replay)
+        self.fps = fps
+        self.index = 0
+
+    def isOpened(self):
+        return len(self.paths) > 0
+
+    def interval(self):
+        return 1.0 / self.fps
+
+    def _peek_time(self):
+        return self.index / self.fps if self.index < len(self.paths) else None
+
+    def _next(self):
+        while self.index < len(self.paths):
+            timestamp = self.index / self.fps
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                return True, timestamp, frame
+            print(f"[WARNING] Could not read {self.paths[self.index - 1]}")
+        return False, None, None
+
+    def _skip(self):
+        if self.index >= len(self.paths):
+            return None
+        self.index += 1
+        return (self.index - 1) / self.fps
+
+    def release(self):
+        pass
+
+
+def open_source(source=None, replay="fast", fps=30.0, camera_cache=None):
+    """Open a frame source from a config/CLI value
+
+    None: first working camera; an int (or digit string): that camera index;
+    rtsp://, http(s)://, ...: a network stream; a directory or glob: an image
+    sequence; anything else: a video file."""
+    if source is None:
+        return CaptureSource(open_camera(camera_cache))
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return CaptureSource(open_device(int(source)), name=f"camera{source}")
+    if "://" in source:
+        return CaptureSource(cv2.VideoCapture(source), name=source, url=source)
+    if os.path.isdir(source) or glob.has_magic(source):
+        return ImageSequenceSource(source, replay=replay, fps=fps)
+    return VideoFileSource(source, replay=replay)
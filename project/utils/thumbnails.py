@@ -0,0 +1,132 @@
+"""
+Employee thumbnails for check-in notifications
+Each employee's first enrollment image, shrunk once to a small PNG under
+output/thumbnails (at enrollment, or lazily the first time it is needed) and
+held decoded in an LRU cache that a background thread fills, so a
+notification only has to wrap pixels that are already in memory.
+"""
+import collections
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import cv2
+from .metrics import METRICS
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+def employee_dir(conf, emp_id):
+    return os.path.join(conf["dataset_path"], conf["class"], emp_id)
+
+
+def thumbnail_path(conf, emp_id):
+    return os.path.join(conf["thumbnail_path"] or "output/thumbnails", f"{emp_id}.png")
+
+
+def build_thumbnail(conf, emp_id):
+    """Write the employee's thumbnail from their first image; returns its path, or None without images"""
+    source_dir = employee_dir(conf, emp_id)
+    try:
+        images = sorted(f for f in os.listdir(source_dir) if f.lower().endswith(IMAGE_EXTENSIONS))
+    except FileNotFoundError:
+        return None
+    image = cv2.imread(os.path.join(source_dir, images[0])) if images else None
+    if image is None:
+        return None
+
+    size = conf["thumbnail_size"] or 100
+    thumb = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+    path = thumbnail_path(conf, emp_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp.png"
+    cv2.imwrite(tmp_path, thumb)
+    os.replace(tmp_path, path)
+    return path
+
+
+def remove_thumbnail(conf, emp_id):
+    try:
+        os.remove(thumbnail_path(conf, emp_id))
+    except FileNotFoundError:
+        pass
+
+
+class ThumbnailCache:
+    """Decoded RGB thumbnails by employee ID, least recently used evicted first
+
+    get() never touches the disk beyond one stat: a missing or changed thumbnail
+    is (re)built and decoded on the loader thread, and get() returns None (or
+    the previous image) until it is ready."""
+
+    def __init__(self, conf, capacity=256):
+        self.conf = conf
+        self.capacity = capacity
+        self.items = collections.OrderedDict()  # emp_id -> (thumbnail mtime, RGB array)
+        self.loading = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+
+    def get(self, emp_id):
+        """The RGB thumbnail (size x size x 3) if it is loaded, else None; schedules a load"""
+        try:
+            mtime = os.stat(thumbnail_path(self.conf, emp_id)).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self.lock:
+            item = self.items.get(emp_id)
+            if item is not None:
+                self.items.move_to_end(emp_id)
+        if item is not None and item[0] == mtime:
+            METRICS.inc("thumbnail_hits")
+            return item[1]
+
+        # Missing, or re-enrolled since it was decoded
+        METRICS.inc("thumbnail_misses")
+        self._schedule(emp_id)
+        return item[1] if item is not None else None
+
+    def prefetch(self, emp_ids):
+        """Load these employees' thumbnails in the background unless they are cached
+
+        At most capacity are taken: more would only evict each other."""
+        for emp_id in itertools.islice(emp_ids, self.capacity):
+            with self.lock:
+                cached = emp_id in self.items
+            if not cached:
+                self._schedule(emp_id)
+
+    def _schedule(self, emp_id):
+        with self.lock:
+            if emp_id in self.loading:
+                return
+            self.loading.add(emp_id)
+        self.executor.submit(self._load, emp_id)
+
+    def _load(self, emp_id):
+        try:
+            path = thumbnail_path(self.conf, emp_id)
+            try:
+                current = os.stat(path).st_mtime >= os.stat(employee_dir(self.conf, emp_id)).st_mtime
+            except OSError:
+                current = False
+            if not current and build_thumbnail(self.conf, emp_id) is None:
+                return
+            mtime = os.stat(path).st_mtime_ns
+            image = cv2.imread(path)
+            if image is None:
+                return
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            with self.lock:
+                self.items[emp_id] = (mtime, rgb)
+                self.items.move_to_end(emp_id)
+                while len(self.items) > self.capacity:
+                    self.items.popitem(last=False)
+        except Exception as e:
+            print(f"[WARNING] Thumbnail for {emp_id} could not be loaded: {e}")
+        finally:
+            with self.lock:
+                self.loading.discard(emp_id)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,156 @@
+"""
+Lightweight face tracker
+Matches detected boxes across frames (IoU, with a centroid fallback) so an
+identity can be carried forward instead of re-encoding the face every pass
+"""
+import itertools
+import threading
+import time
+
+
+def box_iou(a, b):
+    """Intersection over union of two (top, right, bottom, left) boxes"""
+    top = max(a[0], b[0])
+    right = min(a[1], b[1])
+    bottom = min(a[2], b[2])
+    left = max(a[3], b[3])
+    if right <= left or bottom <= top:
+        return 0.0
+
+    inter = (right - left) * (bottom - top)
+    area_a = (a[1] - a[3]) * (a[2] - a[0])
+    area_b = (b[1] - b[3]) * (b[2] - b[0])
+    return inter / float(area_a + area_b - inter)
+
+
+def box_centroid_distance(a, b):
+    """Distance between box centres, relative to the width of box a"""
+    ax, ay = (a[1] + a[3]) / 2.0, (a[0] + a[2]) / 2.0
+    bx, by = (b[1] + b[3]) / 2.0, (b[0] + b[2]) / 2.0
+    width = max(1, a[1] - a[3])
+    return ((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 / width
+
+
+class Track:
+    """A face followed across frames"""
+
+    def __init__(self, track_id, box, now):
+        self.track_id = track_id
+        self.box = box
+        self.person = None
+        self.confidence = 0.0
+        self.first_seen = now
+        self.last_seen = now
+        self.last_encoded = None
+        self.missed = 0
+        self.classified = 0  # identities assigned since it was last confirmed or changed person
+        self.confirmed = False
+
+
+class FaceTracker:
+    """Assigns track IDs to face boxes and decides which faces need a fresh encoding"""
+
+    def __init__(self, iou_threshold=0.3, max_centroid_distance=0.5, max_missed=5,
+                 min_confidence=0.5, reverify_seconds=5.0, vote_window=10):
+        self.iou_threshold = iou_threshold
+        self.max_centroid_distance = max_centroid_distance
+        self.max_missed = max_missed
+        self.min_confidence = min_confidence
+        self.reverify_seconds = reverify_seconds
+        self.vote_window = vote_window  # passes a track keeps being encoded while it is voted on
+
+        self.lock = threading.Lock()
+        self.tracks = []
+        self.ids = itertools.count(1)
+
+    def update(self, boxes, now=None):
+        """Match this pass's boxes to existing tracks; returns the tracks for the boxes, in order"""
+        now = time.time() if now is None else now
+        with self.lock:
+            # Greedy matching on IoU, best overlaps first
+            pairs = sorted(((box_iou(t.box, box), ti, bi)
+                            for ti, t in enumerate(self.tracks)
+                            for bi, box in enumerate(boxes)), reverse=True)
+            matched = {}
+            used_tracks = set()
+            for iou, ti, bi in pairs:
+                if iou < self.iou_threshold:
+                    break
+                if ti in used_tracks or bi in matched:
+                    continue
+                matched[bi] = ti
+                used_tracks.add(ti)
+
+            # Fast movement can kill the overlap; fall back to the nearest centre
+            for bi, box in enumerate(boxes):
+                if bi in matched:
+                    continue
+                candidates = [(box_centroid_distance(t.box, box), ti)
+                              for ti, t in enumerate(self.tracks) if ti not in used_tracks]
+                if candidates:
+                    distance, ti = min(candidates)
+                    if distance <= self.max_centroid_distance:
+                        matched[bi] = ti
+                        used_tracks.add(ti)
+
+            result = []
+            for bi, box in enumerate(boxes):
+                if bi in matched:
+                    track = self.tracks[matched[bi]]
+                    track.box = box
+                    track.last_seen = now
+                    track.missed = 0
+                else:
+                    track = Track(next(self.ids), box, now)
+                result.append(track)
+
+            # Keep unmatched tracks alive for a few passes to ride out missed detections
+            for ti, track in enumerate(self.tracks):
+                if ti not in used_tracks:
+                    track.missed += 1
+            self.tracks = [t for ti, t in enumerate(self.tracks)
+                           if ti not in used_tracks and t.missed <= self.max_missed]
+            self.tracks.extend(result)
+            return result
+
+    def needs_encoding(self, track, now=None):
+        """New, low-confidence, still-voting or due-for-reverification tracks must be re-encoded
+
+        Only fresh identities vote, so a track is encoded every pass until it is
+        confirmed or has filled a vote window without being confirmed."""
+        now = time.time() if now is None else now
+        if track.person is None or track.last_encoded is None:
+            return True
+        if track.confidence < self.min_confidence:
+            return True
+        if not track.confirmed and track.classified < self.vote_window:
+            return True
+        return now - track.last_encoded >= self.reverify_seconds
+
+    def assign(self, track, person, confidence, now=None):
+        """Store a fresh identity for a track"""
+        if person != track.person:
+            # A different person starts a new vote
+            track.classified = 0
+            track.confirmed = False
+        track.person = person
+        track.confidence = confidence
+        track.last_encoded = time.time() if now is None else now
+        track.classified += 1
+
+    def confirm(self, track_ids):
+        """Mark tracks whose identity the voter confirmed; they fall back to reverification"""
+        with self.lock:
+            for track in self.tracks:
+                if track.track_id in track_ids:
+                    track.confirmed = True
+                    track.classified = 0
+
+    def boxes(self):
+        """Boxes of the tracks currently alive"""
+        with self.lock:
+            return [t.box for t in self.tracks]
+
+    def reset(self):
+        with self.lock:
+            self.tracks = []
@@ -0,0 +1,63 @@
+"""
+Temporal voting
+Decides when a tracked face has been recognised consistently enough to record
+attendance. Every track keeps its own sliding window of votes, so another
+face entering the frame never resets someone else's confirmation.
+"""
+import collections
+from .matcher import UNKNOWN
+
+
+class TemporalVoter:
+    """Confirms a track's identity after min_votes of its last window votes agree,
+    or earlier once the agreeing votes' confidences add up to early_score"""
+
+    def __init__(self, window=10, min_votes=6, early_score=2.7, max_missed=5):
+        self.window = window
+        self.min_votes = min_votes
+        self.early_score = early_score  # e.g. three votes at 90%; 0 disables the early accept
+        self.max_missed = max_missed  # passes a track may be absent before its votes are dropped
+        self.votes = {}  # track_id -> deque of (person, confidence)
+        self.missed = {}  # track_id -> passes since the track was last seen
+
+    def update(self, faces, classified=None):
+        """Add one recognition pass [(box, person, confidence, track_id)]; returns confirmed person IDs
+
+        Only the tracks in classified (every face when None) were matched on this
+        pass and vote; the rest only carry their earlier identity forward, and a
+        carried identity counting again would let one wrong match confirm itself."""
+        seen = set()
+        confirmed = []
+        for (_, person, confidence, track_id) in faces:
+            seen.add(track_id)
+            self.missed[track_id] = 0
+            if classified is not None and track_id not in classified:
+                continue
+            votes = self.votes.get(track_id)
+            if votes is None:
+                votes = self.votes[track_id] = collections.deque(maxlen=self.window)
+            votes.append((person, confidence))
+
+            if person is None or person == UNKNOWN:
+                continue
+            agreeing = [c for (p, c) in votes if p == person]
+            if len(agreeing) >= self.min_votes or (self.early_score > 0 and sum(agreeing) >= self.early_score):
+                confirmed.append(person)
+                # Start over, so the same person is confirmed again only after a new run of votes
+                votes.clear()
+
+        # Forget tracks that left the frame
+        for track_id in list(self.votes):
+            if track_id in seen:
+                continue
+            self.missed[track_id] = self.missed.get(track_id, 0) + 1
+            if self.missed[track_id] > self.max_missed:
+                del self.votes[track_id]
+                del self.missed[track_id]
+
+        # Two tracks on the same person (e.g. a track split) confirm them once
+        return list(dict.fromkeys(confirmed))
+
+    def reset(self):
+        self.votes = {}
+        self.missed = {}
@@ -0,0 +1,194 @@
+"""
+File watchers
+Notice when training or enrollment, on this or another machine, has changed
+the files the kiosk runs from, and do the loading on a background thread so
+the video loop only ever applies finished results in between frames.
+"""
+import abc
+import os
+import queue
+import threading
+from .matcher import load_matcher
+from .metrics import METRICS
+from .roster import read_roster
+
+
+def file_signature(path):
+    """(path, mtime, size); changes whenever the file is rewritten"""
+    try:
+        st = os.stat(path)
+        return (path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (path, None, None)
+
+
+def model_files(conf):
+    """The files the configured matcher is loaded from"""
+    method = conf["matcher"] or "svc"
+    if method == "knn":
+        return [conf["encodings_path"]]
+    if method == "ann":
+        return [conf["ann_index_path"]]
+    manifest = os.path.join(conf["model_path"] or "output/model", "manifest.json")
+    if os.path.exists(manifest):
+        return [manifest]
+    return [conf["recognizer_path"], conf["le_path"]]
+
+
+def model_signature(conf):
+    """Signatures of every model file; changes whenever a new model is written"""
+    return tuple(file_signature(path) for path in model_files(conf))
+
+
+class PollingWatcher(abc.ABC):
+    """Background thread that calls check() every interval, or at once on request()
+
+    check(forced) gets None on a timed poll, False on request(force=False) and
+    True on request()."""
+
+    def __init__(self, interval=2.0, name="Watcher"):
+        self.interval = interval
+        self.forced = None
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def request(self, force=True):
+        """Check now; load even if nothing changed (e.g. the reload key) unless force is False
+
+        A watcher that was never started (interval off) checks on the caller's thread."""
+        if not self.thread.is_alive() and not self.stopped:
+            self.check(force)
+            return
+        with self.lock:
+            self.forced = bool(self.forced) or force
+        self.wake.set()
+
+    def _run(self):
+        while True:
+            # interval 0 only checks on request()
+            self.wake.wait(self.interval or None)
+            self.wake.clear()
+            if self.stopped:
+                return
+            with self.lock:
+                forced, self.forced = self.forced, None
+            self.check(forced)
+
+    @abc.abstractmethod
+    def check(self, forced):
+        """Look for a change and load it; a true forced loads even when nothing changed"""
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(5.0)
+
+
+class ModelWatcher(PollingWatcher):
+    """Polls the model files and loads a changed model off the caller's thread
+
+    A change is loaded once the files have stayed the same for one poll interval
+    (pickles are not written atomically), with load_matcher(verify=True). poll()
+    hands the new matcher over exactly once; a model that fails to load is
+    skipped until the files change again. request(force=False) loads a change
+    at once, without the wait, and nothing if the files are what is running.
+    With interval 0 it only loads on request()."""
+
+    def __init__(self, conf, interval=2.0, log=print):
+        super().__init__(interval, name="ModelWatcher")
+        self.conf = conf
+        self.log = log
+        self.signature = model_signature(conf)  # what the running matcher was loaded from
+        self.failed = None  # signature that failed to load
+        self.settling = None  # changed signature waiting one interval
+        self.ready = None  # loaded matcher waiting for poll()
+
+    def poll(self):
+        """The newly loaded matcher, or None; cheap enough to call every frame"""
+        with self.lock:
+            matcher, self.ready = self.ready, None
+        return matcher
+
+    def check(self, forced):
+        signature = model_signature(self.conf)
+        if not forced:
+            if signature == self.signature or signature == self.failed:
+                self.settling = None
+                return
+            if signature != self.settling and forced is None:
+                # Still being written, or just appeared: look again next interval
+                self.settling = signature
+                return
+        self.settling = None
+        self._load(signature)
+
+    def _load(self, signature):
+        try:
+            with METRICS.timer("model_load"):
+                matcher = load_matcher(self.conf, verify=True)
+        except Exception as e:
+            self.failed = signature
+            METRICS.inc("model_reload_failures")
+            self.log(f"[WARNING] New model could not be loaded, keeping the current one: {e}")
+            return
+
+        self.signature = signature
+        self.failed = None
+        with self.lock:
+            self.ready = matcher
+        METRICS.inc("model_reloads")
+        version = getattr(matcher, "version", None)
+        self.log(f"[INFO] Loaded new model{f' version {version}' if version else ''}")
+
+
+class RosterWatcher(PollingWatcher):
+    """Follows the enrollment database and queues only the employees added or removed
+
+    TinyDB rewrites the whole file on every change, so the parse happens here on
+    the watcher thread; the caller applies the small diff with apply()."""
+
+    def __init__(self, db_path, roster, interval=2.0, log=print):
+        super().__init__(interval, name="RosterWatcher")
+        self.db_path = db_path
+        self.log = log
+        self.known = dict(roster)  # what the caller's roster holds once every diff is applied
+        self.signature = file_signature(db_path)
+        self.changes = queue.Queue()  # (added {id: name}, removed [id])
+
+    def check(self, forced):
+        signature = file_signature(self.db_path)
+        if signature == self.signature and not forced:
+            return
+        try:
+            roster = read_roster(self.db_path)
+        except (OSError, ValueError):
+            return  # missing or mid-write; the next change or interval retries
+        self.signature = signature
+
+        added = {emp_id: name for emp_id, name in roster.items() if self.known.get(emp_id) != name}
+        removed = [emp_id for emp_id in self.known if emp_id not in roster]
+        if added or removed:
+            self.known = roster
+            self.changes.put((added, removed))
+            METRICS.inc("roster_updates")
+            self.log(f"[INFO] Roster updated: {len(added)} added/renamed, {len(removed)} removed")
+
+    def apply(self, roster):
+        """Apply queued changes to roster in place; returns the IDs added or renamed"""
+        updated = []
+        while True:
+            try:
+                added, removed = self.changes.get_nowait()
+            except queue.Empty:
+                return updated
+            roster.update(added)
+            for emp_id in removed:
+                roster.pop(emp_id, None)
+            updated.extend(added)
@@ -1,229 +1,9 @@
-import tkinter as tk
-from tkinter import messagebox
-import cv2
 import time
-import platform
-import os
-import numpy as np
-from PIL import Image, ImageTk
-from datetime import datetime
-import pickle
-import json
-import sqlite3
-from tinydb import TinyDB, where
-import face_recognition
-from project.utils import Conf
-
-# Initialize the configuration and recognizer
-conf = Conf("config/config.json")
-recognizer = pickle.loads(open(conf["recognizer_path"], "rb").read())
-le = pickle.loads(open(conf["le_path"], "rb").read())
-
-# Initialize the TinyDB for attendance and students
-db = TinyDB(conf["db_path"])
-studentTable = db.table("student")
-json_file_path_enroll = 'database/enroll.json'
-
-def open_camera():
-    """Open camera with best available method for the platform"""
-    if platform.system() == 'Windows':
-        return cv2.VideoCapture(0, cv2.CAP_DSHOW)
-    
-    # For Raspberry Pi 5 and other Linux systems
-    # Try V4L2 backend with multiple indices
-    for idx in [0, 1, 2]:
-        cap = cv2.VideoCapture(idx, cv2.CAP_V4L2)
-        if cap.isOpened():
-            ret, _ = cap.read()
-            if ret:
-                cap.release()
-                return cv2.VideoCapture(idx, cv2.CAP_V4L2)
-            cap.release()
-    
-    # Fallback to default backend
-    for idx in [0, 1, 2]:
-        cap = cv2.VideoCapture(idx)
-        if cap.isOpened():
-            ret, _ = cap.read()
-            if ret:
-                return cap
-            cap.release()
-    
-    return cv2.VideoCapture(0)
-
-# Initialize SQLite database for attendance
-attendance_db_path = 'database/attendance.db'
-conn = sqlite3.connect(attendance_db_path, check_same_thread=False)
-cursor = conn.cursor()
-
-# Create attendance table if not exists
-cursor.execute('''
-    CREATE TABLE IF NOT EXISTS attendance (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        employee_id TEXT NOT NULL,
-        employee_name TEXT NOT NULL,
-        date TEXT NOT NULL,
-        check_in TEXT NOT NULL,
-        check_out TEXT,
-        working_hours REAL DEFAULT 0,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE(employee_id, date)
-    )
-''')
-cursor.execute('''
-    CREATE INDEX IF NOT EXISTS idx_employee_date 
-    ON attendance(employee_id, date)
-''')
-conn.commit()
-
-# Initialize the video capture (cross-platform compatible)
-print("[INFO] Opening camera...")
-vs = open_camera()
-
-# Verify camera opened successfully
-if not vs.isOpened():
-    print("[ERROR] Failed to open camera!")
-    print("Please check:")
-    print("  1. Camera is connected properly")
-    print("  2. Camera permissions are granted")
-    print("  3. No other application is using the camera")
-    print("  4. Run diagnostic: python3 test_camera.py")
-    print("  5. On Raspberry Pi 5: Camera might be at different index")
-    exit(1)
-
-print("[SUCCESS] Camera opened successfully!")
+STARTUP = time.perf_counter()
 
-vs.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-vs.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-vs.set(cv2.CAP_PROP_FPS, 30)
-
-# Cache for student names to avoid repeated database queries
-student_name_cache = {}
-for record in studentTable.all():
-    for student_id, details in record.items():
-        student_name_cache[student_id] = details[0]
-
-# Cache for today's attendance to reduce database queries
-attendance_cache = {}
-current_cache_date = datetime.now().strftime("%Y-%m-%d")
-
-# Cooldown tracking: employee_id -> last_checkout_timestamp
-checkout_cooldown = {}  # 10-minute cooldown after checkout
-COOLDOWN_MINUTES = 10
-
-def load_today_attendance():
-    """Load today's attendance into cache on startup"""
-    global attendance_cache, current_cache_date
-    today = datetime.now().strftime("%Y-%m-%d")
-    current_cache_date = today
-    
-    cursor.execute('''
-        SELECT employee_id, employee_name, check_in, check_out, working_hours
-        FROM attendance
-        WHERE date = ?
-    ''', (today,))
-    
-    rows = cursor.fetchall()
-    attendance_cache = {}
-    for row in rows:
-        emp_id, emp_name, check_in, check_out, working_hours = row
-        attendance_cache[emp_id] = {
-            'name': emp_name,
-            'check_in': check_in,
-            'check_out': check_out,
-            'working_hours': working_hours
-        }
-
-# Load today's attendance on startup
-load_today_attendance()
-
-# Frame processing counter - process every Nth frame for face detection
-frame_counter = 0
-process_every_n_frames = 3  # Process every 3rd frame for better FPS
-# Function to store attendance with IN/OUT tracking (optimized with SQLite and caching)
-def store_attendance(name, id):
-    global attendance_cache, current_cache_date, checkout_cooldown
-    
-    if not name or name.lower() == "unknown":
-        print("Face not recognized, attendance not stored.")
-        return
-
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    current_timestamp = datetime.now()
-    
-    # Check if employee is in cooldown period (10 minutes after last checkout)
-    if id in checkout_cooldown:
-        time_since_checkout = (current_timestamp - checkout_cooldown[id]).total_seconds() / 60
-        if time_since_checkout < COOLDOWN_MINUTES:
-            remaining = COOLDOWN_MINUTES - int(time_since_checkout)
-            print(f"Employee {name} (ID: {id}) is in cooldown. {remaining} minutes remaining.")
-            return None  # Ignore detection during cooldown
-    
-    # Check if date changed (new day) - reload cache
-    if current_date != current_cache_date:
-        load_today_attendance()
-
-    # Check if employee has any record today in cache
-    if id in attendance_cache:
-        employee_record = attendance_cache[id]
-        
-        # Same day - update check_out time (allows multiple updates)
-        attendance_cache[id]['check_out'] = current_time
-        print(f"Check-OUT updated for {name} (ID: {id}) at {current_time}")
-        
-        # Calculate working hours
-        check_in_dt = datetime.strptime(employee_record['check_in'], "%Y-%m-%d %H:%M:%S")
-        check_out_dt = datetime.strptime(current_time, "%Y-%m-%d %H:%M:%S")
-        duration = check_out_dt - check_in_dt
-        hours = duration.total_seconds() / 3600
-        attendance_cache[id]['working_hours'] = round(hours, 2)
-        
-        # Update database using UPSERT
-        cursor.execute('''
-            INSERT INTO attendance (employee_id, employee_name, date, check_in, check_out, working_hours, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
-            ON CONFLICT(employee_id, date) 
-            DO UPDATE SET 
-                check_out = excluded.check_out,
-                working_hours = excluded.working_hours,
-                updated_at = datetime('now')
-        ''', (id, name, current_date, employee_record['check_in'], current_time, round(hours, 2)))
-        conn.commit()
-        
-        # Set cooldown timer (10 minutes from now)
-        checkout_cooldown[id] = current_timestamp
-        print(f"Cooldown activated for {name} (ID: {id}) - 10 minutes")
-        
-        return f"Check-OUT Updated: {name} | Total hours: {round(hours, 2)}h", "checkout", id, current_time, round(hours, 2)
-    else:
-        # First check-in of the day
-        attendance_cache[id] = {
-            "name": name,
-            "check_in": current_time,
-            "check_out": None,
-            "working_hours": 0
-        }
-        
-        # Clear cooldown on new check-in (new day)
-        if id in checkout_cooldown:
-            del checkout_cooldown[id]
-        
-        print(f"Check-IN recorded for {name} (ID: {id}) at {current_time}")
-        
-        # Insert into database
-        cursor.execute('''
-            INSERT INTO attendance (employee_id, employee_name, date, check_in, check_out, working_hours)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(employee_id, date) 
-            DO UPDATE SET 
-                check_in = excluded.check_in,
-                updated_at = datetime('now')
-        ''', (id, name, current_date, current_time, None, 0))
-        conn.commit()
-        
-        return f"Check-IN: {name} marked present at {current_time.split(' ')[1]}", "checkin", id, current_time, 0
+# Show the window with a splash before anything heavy is imported or loaded
+import tkinter as tk
+from tkinter import messagebox
 
 # Tkinter window setup
 root = tk.Tk()
@@ -242,6 +22,115 @@ window_height = video_height + 150  # Extra space for status labels
 root.geometry(f"{video_width}x{window_height}+{(screen_width-video_width)//2}+20")
 root.configure(bg="#1a1a1a")
 
+splash = tk.Label(root, text="Employee Attendance System\n\nStarting...", font=("Arial", 20, "bold"),
+                  bg="#1a1a1a", fg="#ffffff")
+splash.pack(expand=True)
+root.update()
+splash_ms = (time.perf_counter() - STARTUP) * 1000
+
+def splash_status(text):
+    splash.config(text=f"Employee Attendance System\n\n{text}")
+    root.update()
+
+import threading
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+from project.utils import Conf, FrameGrabber, RecognitionWorker, AttendanceStore, load_roster
+from project.utils import AdaptiveScheduler, RateMeter, MotionDetector
+from project.utils import open_camera, configure_camera, print_camera_help
+from project.utils import METRICS, start_exporters, ModelWatcher, RosterWatcher, ThumbnailCache
+from project.utils.engine import RecognitionEngine, warm_up
+from project.utils.render import CanvasRenderer
+
+conf = Conf("config/config.json")
+json_file_path_enroll = 'database/enroll.json'
+
+# Initialize the video capture (cross-platform compatible) on a helper thread while
+# the models load; the last working index/backend is tried first
+print("[INFO] Opening camera...")
+camera = {}
+def open_camera_thread():
+    start = time.perf_counter()
+    camera["vs"] = open_camera(conf["camera_cache_path"])
+    camera["ms"] = (time.perf_counter() - start) * 1000
+camera_thread = threading.Thread(target=open_camera_thread, name="open-camera", daemon=True)
+camera_thread.start()
+
+# Initialize the recognition engine (matcher, tracker and doorway zone selected in
+# config.json) and load dlib's models
+splash_status("Loading face models...")
+models_start = time.perf_counter()
+engine = RecognitionEngine(conf, scale=0.5)
+warm_up()
+models_ms = (time.perf_counter() - models_start) * 1000
+
+# New models (training here or on another machine) load in the background and
+# are swapped in between frames
+model_watcher = ModelWatcher(conf, interval=conf["model_watch_interval"]).start()
+
+# SQLite attendance table with today's records cached in memory
+attendance = AttendanceStore()
+
+# Cache for student names to avoid repeated database queries; employees enrolled
+# or deleted later arrive as small diffs from the roster watcher
+student_name_cache = load_roster(conf["db_path"])
+roster_watcher = RosterWatcher(conf["db_path"], student_name_cache, interval=conf["roster_watch_interval"])
+if conf["roster_watch_interval"]:
+    roster_watcher.start()
+
+# Notification photos, decoded in the background while a face is being voted on
+thumbnails = ThumbnailCache(conf)
+
+splash_status("Opening camera...")
+camera_thread.join()
+vs = camera["vs"]
+
+# Verify camera opened successfully
+if not vs.isOpened():
+    print_camera_help()
+    attendance.close()
+    root.destroy()
+    exit(1)
+
+print("[SUCCESS] Camera opened successfully!")
+configure_camera(vs, 640, 480, 30)
+
+# Capture thread always holds the newest frame so slow recognition never stalls the video
+grabber = FrameGrabber(vs, name="camera").start()
+
+# Stage timing metrics: Prometheus text file / local HTTP endpoint, optional overlay
+exporters = start_exporters(conf)
+show_metrics = bool(conf["metrics_overlay"])
+
+# Frame counter and adaptive frame-skip: how often recognition runs follows the
+# measured stage times, the target display FPS and the latency budget
+frame_counter = 0
+scheduler = AdaptiveScheduler(
+    target_fps=conf["target_fps"],
+    max_latency=conf["max_recognition_latency"],
+    idle_after=conf["idle_after_seconds"],
+    idle_interval=conf["idle_interval_seconds"],
+)
+display_meter = RateMeter()
+capture_meter = RateMeter()
+
+# Motion gate: skip face detection entirely while the scene is static
+motion = None
+if conf["motion_gate"]:
+    motion = MotionDetector(
+        threshold=conf["motion_threshold"],
+        min_area=conf["motion_min_area"],
+        learning_rate=conf["motion_learning_rate"],
+    )
+motion_skipped = 0  # recognition passes skipped because nothing moved
+
+# Startup budget: window/splash, model load, camera open (in parallel) and total
+splash.destroy()
+print(f"[INFO] Startup: splash {splash_ms:.0f} ms, models {models_ms:.0f} ms, "
+      f"camera {camera['ms']:.0f} ms (parallel), ready {(time.perf_counter() - STARTUP) * 1000:.0f} ms")
+METRICS.observe("startup", time.perf_counter() - STARTUP)
+
 # Fullscreen toggle variable
 is_fullscreen = False
 
@@ -249,6 +138,11 @@ is_fullscreen = False
 canvas = tk.Canvas(root, width=video_width-20, height=window_height-20, bg="#000000", highlightthickness=0)
 canvas.pack(fill=tk.BOTH, expand=True)
 
+# One reused canvas item/PhotoImage; the canvas redraws at render_fps at most,
+# independent of the camera rate
+renderer = CanvasRenderer(canvas)
+render_interval_ms = max(1, int(1000 / conf["render_fps"]))
+
 # Notification panel for check-in/check-out (initially hidden)
 notification_frame = tk.Frame(root, bg="#ffffff", relief="raised", borderwidth=3)
 notification_label = tk.Label(notification_frame, text="", font=("Arial", 20, "bold"), bg="#ffffff", fg="#000000")
@@ -284,22 +178,12 @@ def show_notification(name, emp_id, action_type, time_str, hours=0):
     notification_label.config(text=title_text, bg=bg_color, fg=fg_color)
     notification_details.config(text=detail_text, bg=bg_color, fg=fg_color)
     
-    # Load employee photo if exists
-    photo_path = os.path.join(conf["dataset_path"], conf["class"], emp_id)
-    if os.path.exists(photo_path):
-        images = [f for f in os.listdir(photo_path) if f.endswith(('.png', '.jpg', '.jpeg'))]
-        if images:
-            img_path = os.path.join(photo_path, images[0])
-            try:
-                photo = Image.open(img_path)
-                photo = photo.resize((100, 100), Image.LANCZOS)
-                photo_tk = ImageTk.PhotoImage(photo)
-                notification_photo_label.config(image=photo_tk, bg=bg_color)
-                notification_photo_label.image = photo_tk
-            except:
-                notification_photo_label.config(image="", bg=bg_color)
-        else:
-            notification_photo_label.config(image="", bg=bg_color)
+    # Employee photo from the thumbnail cache (already decoded, no disk access)
+    thumb = thumbnails.get(emp_id)
+    if thumb is not None:
+        photo_tk = ImageTk.PhotoImage(Image.fromarray(thumb))
+        notification_photo_label.config(image=photo_tk, bg=bg_color)
+        notification_photo_label.image = photo_tk
     else:
         notification_photo_label.config(image="", bg=bg_color)
     
@@ -310,104 +194,129 @@ def show_notification(name, emp_id, action_type, time_str, hours=0):
     root.after(3000, lambda: notification_frame.place_forget())
 
 # Initialize variables
-prevPerson = None
-curPerson = None
-consecCount = 0
 video_running = False  # Flag to check if the video feed is running
-last_boxes = []  # Store last detected boxes
-last_person_name = ""  # Store last recognized person name
+last_faces = []  # Last recognized faces: (box, name, confidence, track_id)
+last_frame_id = 0  # Last camera frame drawn on the canvas
+render_dropped = 0  # Recognition results superseded before they were drawn
+
+# Recognition worker fed from a bounded queue; stale frames are dropped, never queued up
+worker = RecognitionWorker(engine.recognize, max_queue_size=1).start()
+
+def handle_recognition(faces, classified):
+    """Apply one recognition result: per-person confirmation, attendance and notification"""
+    global last_faces
+
+    # Scale boxes back to original frame size; use cached student names instead of database query
+    last_faces = [(box, student_name_cache.get(person, "Unknown"), confidence, track_id)
+                  for (box, person, confidence, track_id) in engine.to_frame(faces)]
+    # Faces start voting before they are confirmed; have their photos ready by then
+    thumbnails.prefetch(person for (_, person, _, _) in faces if person in student_name_cache)
+
+    # Store attendance once a tracked face wins its vote (reduces writes)
+    for person in engine.confirm(faces, classified):
+        name = student_name_cache.get(person, "Unknown")
+        result = attendance.store(name, person)
+        if result:
+            attn_info, action_type, emp_id, time_str, hours = result
+            # Show notification
+            with METRICS.timer("notify"):
+                show_notification(name, emp_id, action_type, time_str, hours)
+
+def pipeline_stats():
+    """Per-stage queue depth and drop counts for the overlay"""
+    cap = grabber.stats()
+    rec = worker.stats()
+    return (f"Q cap:{cap['depth']} rec:{rec['depth']} | "
+            f"Drop cap:{cap['dropped']} rec:{rec['dropped']} draw:{render_dropped} | "
+            f"Rec {rec['duration']*1000:.0f}ms | Scan {engine.region.last_mode} {engine.region.last_scanned*100:.0f}%")
 
 # Function to update the GUI with the video feed and attendance status
 def update_frame():
-    global prevPerson, curPerson, consecCount, video_running, frame_counter, last_boxes, last_person_name
+    global video_running, frame_counter, last_frame_id, render_dropped, motion_skipped
 
     if not video_running:
         return  # Stop updating frames if video is not running
-
-    ret, frame = vs.read()
-    if not ret:
-        print("Failed to grab frame")
+    tick_start = time.perf_counter()
+
+    # A model the watcher finished loading takes over from the next recognition pass
+    matcher = model_watcher.poll()
+    if matcher is not None:
+        engine.reload(matcher)
+
+    # Newly enrolled employees get their names without a restart; photos load when they are seen
+    roster_watcher.apply(student_name_cache)
+
+    # Apply every result the worker finished; each one counts towards attendance,
+    # but only the newest boxes are drawn
+    results = worker.poll()
+    for frame_id, (faces, timings, classified) in results:
+        scheduler.record(timings, len(faces))
+        handle_recognition(faces, classified)
+    if len(results) > 1:
+        render_dropped += len(results) - 1
+
+    frame_id, frame = grabber.read()
+    if frame is None or frame_id == last_frame_id:
+        # No new frame from the camera yet
+        root.after(render_interval_ms, update_frame)
         return
+    last_frame_id = frame_id
 
     frame_counter += 1
+    # The display can never beat the camera or the render cap
+    source_fps = min(capture_meter.update(grabber.frames_captured), conf["render_fps"])
+    scheduler.update_rates(display_meter.update(frame_counter), source_fps)
     
-    # Resize frame for faster processing (scale down by 0.5)
-    small_frame = cv2.resize(frame, (0, 0), fx=0.5, fy=0.5)
+    # A change in the scene wakes the scheduler out of idle mode straight away
+    moving = motion.update(frame) if motion else True
+    if moving:
+        scheduler.note_activity()
     
-    # Only process face detection/recognition every N frames
-    if frame_counter % process_every_n_frames == 0:
-        # Convert to RGB for face_recognition (no grayscale needed)
-        rgb_small = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
-        # Detect faces on smaller frame
-        boxes = face_recognition.face_locations(rgb_small, model=conf["detection_method"])
-        
-        # Scale boxes back to original frame size
-        last_boxes = [(top*2, right*2, bottom*2, left*2) for (top, right, bottom, left) in boxes]
-
-        if len(boxes) > 0:
-            # Get encodings from smaller frame
-            encodings = face_recognition.face_encodings(rgb_small, boxes)
-            preds = recognizer.predict_proba(encodings)[0]
-            j = np.argmax(preds)
-            curPerson = le.classes_[j]
-
-            if prevPerson == curPerson:
-                consecCount += 1
-            else:
-                consecCount = 0
-
-            prevPerson = curPerson
-
-            # Use cached student names instead of database query
-            name = student_name_cache.get(curPerson, "Unknown")
-            last_person_name = name
-            
-            # Only store attendance every 10 consecutive frames (reduce writes)
-            if consecCount == 10:
-                result = store_attendance(name, curPerson)
-                if result:
-                    attn_info, action_type, emp_id, time_str, hours = result
-                    # Show notification
-                    show_notification(name, emp_id, action_type, time_str, hours)
-                # Reset counter to allow next check-out after some time
-                consecCount = 0
+    # Only process face detection/recognition when the scheduler says so, and only
+    # if something moved or faces are still being tracked
+    if scheduler.should_process():
+        if moving or last_faces:
+            # Resize frame for faster processing (scale down by 0.5)
+            small_frame = engine.shrink(frame)
+            worker.submit(frame_id, small_frame)
         else:
-            last_person_name = ""
+            motion_skipped += 1
+            METRICS.inc("motion_skipped")
     
-    # Draw rectangles on every frame using last detected boxes
-    for (top, right, bottom, left) in last_boxes:
+    # Outline the doorway zone and draw rectangles on every frame using last detected boxes
+    engine.region.draw(frame, scale=engine.scale)
+    for ((top, right, bottom, left), name, confidence, track_id) in last_faces:
         cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 2)
-        if last_person_name:
-            cv2.putText(frame, last_person_name, (left, top - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        cv2.putText(frame, f"#{track_id} {name} {confidence*100:.0f}%", (left, top - 10), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
     
     # Add status text
-    cv2.putText(frame, "Status: Detecting", (10, 20), 
+    status = "Detecting" if moving or last_faces else "Idle (no motion)"
+    if motion:
+        status += f" | motion {motion.changed*100:.1f}% skipped {motion_skipped}"
+    cv2.putText(frame, f"Status: {status}", (10, 20), 
                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    cv2.putText(frame, pipeline_stats(), (10, 40),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+    cv2.putText(frame, scheduler.overlay_text(), (10, 58),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
+    if show_metrics:
+        cv2.putText(frame, METRICS.overlay_text(), (10, 76),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 255), 1)
 
-    # Convert the frame to an ImageTk object and update the canvas
-    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    
-    # Resize frame to fit canvas
-    canvas_width = canvas.winfo_width()
-    canvas_height = canvas.winfo_height()
-    if canvas_width > 1 and canvas_height > 1:
-        img = Image.fromarray(frame_rgb)
-        img = img.resize((canvas_width, canvas_height), Image.LANCZOS)
-        img_tk = ImageTk.PhotoImage(image=img)
-        
-        canvas.create_image(0, 0, anchor="nw", image=img_tk)
-        canvas.image = img_tk
-
-    # Repeat the frame update every 10 milliseconds
-    root.after(10, update_frame)
+    # Scale the frame into the reused canvas image
+    renderer.render(frame)
+
+    # Repeat the frame update at the render rate, minus the time this tick took
+    elapsed_ms = int((time.perf_counter() - tick_start) * 1000)
+    root.after(max(1, render_interval_ms - elapsed_ms), update_frame)
 
 # Start video function
 def start_video():
     global video_running
     if not video_running:
-        reload_models()  # Reload models to get latest training
+        # Pick up training done while stopped, in the background; nothing if the model is current
+        model_watcher.request(force=False)
         video_running = True
         update_frame()
 
@@ -418,20 +327,15 @@ def stop_video():
 
 # Reset function
 def reset_status():
-    global consecCount, prevPerson, curPerson
-    consecCount = 0
-    prevPerson = None
-    curPerson = None
+    engine.reset()
 
 def reload_models():
-    """Reload recognizer and label encoder from disk (after new training)"""
-    global recognizer, le
-    try:
-        recognizer = pickle.loads(open(conf["recognizer_path"], "rb").read())
-        le = pickle.loads(open(conf["le_path"], "rb").read())
-        print("Models reloaded successfully!")
-    except Exception as e:
-        print(f"Error reloading models: {e}")
+    """Reload the matcher from disk (after new training) without blocking the video"""
+    model_watcher.request()
+
+def toggle_metrics():
+    global show_metrics
+    show_metrics = not show_metrics
 
 # Toggle fullscreen
 def toggle_fullscreen(event=None):
@@ -443,9 +347,17 @@ def toggle_fullscreen(event=None):
 def exit_program(event=None):
     global video_running
     video_running = False
+    model_watcher.stop()
+    roster_watcher.stop()
+    thumbnails.close()
+    worker.stop()
+    grabber.stop()
     vs.release()
     cv2.destroyAllWindows()
-    conn.close()
+    attendance.close()
+    for exporter in exporters:
+        exporter.stop()
+    exporters.clear()
     root.quit()
 
 # Keyboard event handler
@@ -464,6 +376,8 @@ def on_key_press(event):
         reload_models()
     elif key == 'p':  # Pause
         stop_video()
+    elif key == 'o':  # Stage timing overlay
+        toggle_metrics()
 
 # Bind keyboard events
 root.bind('<KeyPress>', on_key_press)
@@ -477,6 +391,13 @@ root.after(1000, start_video)  # Start after 1 second
 root.mainloop()
 
 # Clean up after exiting the Tkinter window
+model_watcher.stop()
+roster_watcher.stop()
+thumbnails.close()
+worker.stop()
+grabber.stop()
 vs.release()
 cv2.destroyAllWindows()
-conn.close()
+attendance.close()
+for exporter in exporters:
+    exporter.stop()
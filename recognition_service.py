@@ -0,0 +1,212 @@
+"""
+Headless Recognition Service
+Runs camera capture, recognition and attendance without Tk or PIL, for
+unattended kiosks and servers. Every camera listed under "cameras" in
+config.json is served by this one process, sharing a pool of
+detection/encoding workers. Stop with SIGTERM/SIGINT (Ctrl+C). A newly
+trained model and newly enrolled employees are picked up automatically; send
+SIGHUP to reload the model and the employee roster at once.
+Sources can also be video files, image folders or RTSP/HTTP streams; recorded
+footage is replayed as fast as possible or at its original timestamps, and
+--replay-start backfills attendance with the footage's own times.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from project.utils import Conf, MotionDetector, AttendanceStore, load_roster, load_matcher
+from project.utils import open_source, configure_camera, print_camera_help, start_exporters
+from project.utils import ModelWatcher, RosterWatcher
+from project.utils.engine import RecognitionEngine, warm_up
+from project.utils.multicam import CameraChannel
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; fields passed via extra={"fields": {...}} are merged in"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+log = logging.getLogger("recognition_service")
+
+def event(message, **fields):
+    log.info(message, extra={"fields": fields})
+
+def camera_configs(conf, sources=None):
+    """--source values, else the "cameras" list from config.json; empty means the first camera found"""
+    if sources:
+        cameras = [{"source": source} for source in sources]
+    else:
+        cameras = conf["cameras"] or [{"name": "camera", "source": None}]
+    return [dict(camera, name=camera.get("name") or f"camera{i}") for i, camera in enumerate(cameras)]
+
+def make_motion_gate(conf):
+    # Motion gate: skip face detection entirely while the scene is static
+    if not conf["motion_gate"]:
+        return None
+    return MotionDetector(
+        threshold=conf["motion_threshold"],
+        min_area=conf["motion_min_area"],
+        learning_rate=conf["motion_learning_rate"],
+    )
+
+def init_worker():
+    """Pool workers leave Ctrl+C to the main process, which shuts them down, and load
+    dlib's models before the first frame arrives"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_up()
+
+def main():
+    # construct the argument parser and parse the arguments
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-c", "--conf", default="config/config.json",
+        help="path to the input configuration file")
+    ap.add_argument("--json-logs", action="store_true",
+        help="write one JSON object per log line")
+    ap.add_argument("--stats-every", type=float, default=60.0,
+        help="seconds between per-camera throughput/latency log lines (0 disables)")
+    ap.add_argument("-s", "--source", action="append",
+        help="camera index, video file, image folder/glob or rtsp:// / http:// URL "
+             "(repeat for several; overrides \"cameras\" in the config)")
+    ap.add_argument("--replay", choices=["fast", "realtime"], default="fast",
+        help="recorded footage: as fast as possible, or at the original timestamps")
+    ap.add_argument("--replay-fps", type=float, default=30.0,
+        help="frame rate of image sequences")
+    ap.add_argument("--replay-start", type=lambda v: datetime.strptime(v, "%Y-%m-%d %H:%M:%S"),
+        help="wall-clock time (YYYY-MM-DD HH:MM:SS) of the first recorded frame; attendance "
+             "is then stored with footage times instead of now")
+    args = vars(ap.parse_args())
+
+    handler = logging.StreamHandler(sys.stdout)
+    if args["json_logs"]:
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
+    # Signals only flip flags; the main loop acts on them
+    stop_requested = threading.Event()
+    reload_requested = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_requested.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_requested.set())
+    if hasattr(signal, "SIGHUP"):  # not available on Windows
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_requested.set())
+
+    conf = Conf(args["conf"])
+    attendance = AttendanceStore(log=lambda message: event(message))
+    roster = {"names": load_roster(conf["db_path"])}
+    matcher = load_matcher(conf)
+    model_watcher = ModelWatcher(conf, interval=conf["model_watch_interval"],
+                                 log=lambda message: event(message)).start()
+    roster_watcher = RosterWatcher(conf["db_path"], roster["names"], interval=conf["roster_watch_interval"],
+                                   log=lambda message: event(message))
+    if conf["roster_watch_interval"]:
+        roster_watcher.start()
+
+    # One pool of detection/encoding processes shared by every camera
+    workers = conf["recognition_workers"] or os.cpu_count() or 1
+    # spawn: the watcher and attendance-writer threads are already running, which is
+    # not safe to fork
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=init_worker)
+    event("Service starting", employees=len(roster["names"]), workers=workers,
+          matcher=conf["matcher"] or "svc")
+
+    def on_result(channel, faces, classified, position):
+        when = None
+        if position is not None and args["replay_start"] is not None:
+            when = args["replay_start"] + timedelta(seconds=position)
+
+        # Store attendance once a tracked face wins its vote (reduces writes)
+        for person in channel.engine.confirm(faces, classified):
+            name = roster["names"].get(person, "Unknown")
+            result = attendance.store(name, person, when)
+            if result:
+                attn_info, action_type, emp_id, time_str, hours = result
+                event("attendance", camera=channel.name, action=action_type, employee_id=emp_id,
+                      employee_name=name, time=time_str, working_hours=hours)
+
+    channels = []
+    exporters = start_exporters(conf)
+    try:
+        for camera in camera_configs(conf, args["source"]):
+            log.info(f"Opening camera {camera['name']}...")
+            vs = open_source(camera.get("source"), replay=args["replay"], fps=args["replay_fps"],
+                             camera_cache=conf["camera_cache_path"])
+            if not vs.isOpened():
+                if vs.live:
+                    print_camera_help()
+                log.error(f"Skipping camera {camera['name']}")
+                continue
+            if vs.live:
+                configure_camera(vs, 640, 480, 30)
+
+            engine = RecognitionEngine(conf, scale=0.5, zone=camera.get("detection_roi"),
+                                       matcher=matcher, executor=pool)
+            channels.append(CameraChannel(camera["name"], vs, engine,
+                                          motion=make_motion_gate(conf), on_result=on_result).start())
+
+        if not channels:
+            log.error("No camera could be opened")
+            sys.exit(1)
+
+        stats_start = time.time()
+        while not stop_requested.wait(0.2):
+            if all(channel.finished.is_set() for channel in channels):
+                event("Replay finished")
+                break
+
+            # A model trained since startup, loaded and verified in the background
+            new_matcher = model_watcher.poll()
+            if new_matcher is not None:
+                matcher = new_matcher
+                for channel in channels:
+                    channel.engine.reload(matcher)
+            roster_watcher.apply(roster["names"])
+
+            # SIGHUP goes through the watchers: they verify before anything is switched, keep
+            # the current model or roster on failure, and stay in step with what is loaded
+            if reload_requested.is_set():
+                reload_requested.clear()
+                event("Reload requested")
+                model_watcher.request()
+                roster_watcher.request()
+
+            if args["stats_every"] > 0 and time.time() - stats_start >= args["stats_every"]:
+                for channel in channels:
+                    event("stats", **channel.stats())
+                stats_start = time.time()
+    finally:
+        log.info("Shutting down...")
+        for channel in channels:
+            if args["stats_every"] > 0:
+                event("stats", **channel.stats())
+        for channel in channels:
+            channel.stop()
+        model_watcher.stop()
+        roster_watcher.stop()
+        pool.shutdown(cancel_futures=True)
+        attendance.close()
+        for exporter in exporters:
+            exporter.stop()
+        log.info("Stopped")
+
+if __name__ == "__main__":
+    main()
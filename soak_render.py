@@ -0,0 +1,135 @@
+"""
+Render Soak Test
+Drives the video canvas with synthetic camera frames for hours and samples
+the process memory, to show the render path does not leak.
+Use --legacy to run the old create_image-per-frame path for comparison.
+"""
+import argparse
+import time
+import tkinter as tk
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+from project.utils.render import CanvasRenderer
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+# construct the argument parser and parse the arguments
+ap = argparse.ArgumentParser()
+ap.add_argument("--hours", type=float, default=8.0,
+    help="how long to run")
+ap.add_argument("--fps", type=float, default=30.0,
+    help="frames rendered per second")
+ap.add_argument("--sample-every", type=float, default=60.0,
+    help="seconds between memory samples")
+ap.add_argument("--max-growth", type=float, default=5.0,
+    help="fail if resident memory grows by more than this many MB after warm-up")
+ap.add_argument("--legacy", action="store_true",
+    help="use the old render path (new PhotoImage and canvas item per frame)")
+args = vars(ap.parse_args())
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable), None if unknown"""
+    if resource is None:
+        # Windows: psutil reports it, if installed
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().rss / 1e6
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+measure_memory = rss_mb() is not None
+if not measure_memory:
+    print("[WARNING] Resident memory cannot be read here (install psutil); only canvas items are checked")
+
+root = tk.Tk()
+root.title("Render Soak Test")
+canvas = tk.Canvas(root, width=1024, height=768, bg="#000000", highlightthickness=0)
+canvas.pack(fill=tk.BOTH, expand=True)
+renderer = CanvasRenderer(canvas)
+
+# A moving test pattern stands in for the 640x480 camera
+frame = np.zeros((480, 640, 3), dtype=np.uint8)
+gradient = np.tile(np.arange(640, dtype=np.uint8), (480, 1))
+
+start = time.time()
+interval_ms = max(1, int(1000 / args["fps"]))
+samples = []
+frames = 0
+next_sample = start
+
+def render_legacy(frame):
+    """The pre-CanvasRenderer path from recognition.py"""
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    img = Image.fromarray(frame_rgb)
+    img = img.resize((canvas.winfo_width(), canvas.winfo_height()), Image.LANCZOS)
+    img_tk = ImageTk.PhotoImage(image=img)
+    canvas.create_image(0, 0, anchor="nw", image=img_tk)
+    canvas.image = img_tk
+
+def tick():
+    global frames, next_sample
+    now = time.time()
+    if now - start >= args["hours"] * 3600:
+        root.quit()
+        return
+
+    frame[:, :, 0] = gradient + np.uint8(frames % 256)
+    frame[:, :, 1] = (frames * 3) % 256
+    frame[:, :, 2] = 0
+    cv2.putText(frame, f"frame {frames}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    if args["legacy"]:
+        render_legacy(frame)
+    else:
+        renderer.render(frame)
+    frames += 1
+
+    if now >= next_sample:
+        samples.append((now - start, rss_mb(), len(canvas.find_all())))
+        elapsed, rss, items = samples[-1]
+        rss_text = f"{rss:8.1f} MB" if rss is not None else "     n/a"
+        print(f"[INFO] {elapsed / 3600:6.2f}h  frames={frames:<9} rss={rss_text}  canvas items={items}")
+        next_sample += args["sample_every"]
+
+    root.after(interval_ms, tick)
+
+root.after(interval_ms, tick)
+root.mainloop()
+
+# Ignore the first 10% of the run (allocator and Tk warm-up)
+steady = samples[len(samples) // 10:]
+if len(steady) < 2:
+    print("[WARNING] Not enough samples; run longer or sample more often")
+    raise SystemExit(0)
+
+print(f"\nFrames rendered:   {frames}")
+print(f"Canvas items:      {steady[-1][2]}")
+if not measure_memory:
+    # The render path reuses one canvas item; a growing count is the leak it fixed
+    if steady[-1][2] > steady[0][2]:
+        print("[FAIL] Canvas items grew during the soak")
+        raise SystemExit(1)
+    print("[PASS] Canvas items stayed flat (memory not measured)")
+    raise SystemExit(0)
+
+hours = np.array([s[0] for s in steady]) / 3600
+rss = np.array([s[1] for s in steady])
+slope = np.polyfit(hours, rss, 1)[0] if hours[-1] > hours[0] else 0.0
+growth = rss[-1] - rss[0]
+
+print(f"RSS start/end:     {rss[0]:.1f} MB / {rss[-1]:.1f} MB")
+print(f"Growth:            {growth:+.1f} MB ({slope:+.2f} MB/hour)")
+
+if growth > args["max_growth"]:
+    print("[FAIL] Memory grew during the soak")
+    raise SystemExit(1)
+print("[PASS] Memory stayed flat")
@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from project.utils.attendance import AttendanceStore
+
+
+class AttendanceStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.db_path = os.path.join(self.dir.name, "attendance.db")
+
+    def rows(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT employee_id, check_in, check_out FROM attendance "
+                                "ORDER BY employee_id").fetchall()
+        finally:
+            conn.close()
+
+    def test_close_flushes_queued_writes(self):
+        # A long flush interval keeps every event queued until close()
+        store = AttendanceStore(self.db_path, log=lambda message: None, flush_interval=30.0)
+        store.store("Alice", "E001", datetime(2026, 1, 5, 9, 0, 0))
+        store.store("Bob", "E002", datetime(2026, 1, 5, 9, 1, 0))
+        store.store("Alice", "E001", datetime(2026, 1, 5, 17, 0, 0))
+        store.close()
+
+        self.assertEqual(store.writer.written, 3)
+        self.assertEqual(self.rows(), [("E001", "2026-01-05 09:00:00", "2026-01-05 17:00:00"),
+                                       ("E002", "2026-01-05 09:01:00", None)])
+
+    def test_cached_records_survive_a_restart(self):
+        store = AttendanceStore(self.db_path, log=lambda message: None)
+        store.store("Alice", "E001", datetime(2026, 1, 5, 9, 0, 0))
+        store.close()
+
+        store = AttendanceStore(self.db_path, log=lambda message: None)
+        store.load_today("2026-01-05")
+        self.assertEqual(store.cache["E001"]["check_in"], "2026-01-05 09:00:00")
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
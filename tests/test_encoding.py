@@ -0,0 +1,74 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from project.utils.encoding import EncodingCache
+
+BOX = (10, 60, 60, 10)
+
+
+class EncodingCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.image = os.path.join(self.dir.name, "1.jpg")
+        self.cache_path = os.path.join(self.dir.name, "cache.pickle")
+        self.write(b"original")
+        self.encodings = [np.arange(128, dtype=np.float64)]
+
+    def write(self, content, mtime_ns=None):
+        with open(self.image, "wb") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.image, ns=(mtime_ns, mtime_ns))
+
+    def stored(self):
+        cache = EncodingCache(self.cache_path)
+        cache.store("E001/1.jpg", self.image, self.encodings, BOX)
+        cache.save()
+        return EncodingCache(self.cache_path)
+
+    def test_unchanged_file_hits_after_a_reload(self):
+        hit = self.stored().lookup("E001/1.jpg", self.image, BOX)
+        np.testing.assert_array_equal(hit[0], self.encodings[0])
+
+    def test_touched_file_with_the_same_content_hits(self):
+        cache = self.stored()
+        os.utime(self.image, ns=(1, 1))
+        self.assertIsNotNone(cache.lookup("E001/1.jpg", self.image, BOX))
+        # The new mtime is remembered, so the next lookup does not hash again
+        self.assertEqual(cache.entries["E001/1.jpg"]["mtime"], 1)
+
+    def test_changed_content_of_the_same_size_misses(self):
+        cache = self.stored()
+        mtime = os.stat(self.image).st_mtime_ns
+        self.write(b"modified", mtime_ns=mtime + 1)
+        self.assertIsNone(cache.lookup("E001/1.jpg", self.image, BOX))
+
+    def test_changed_size_misses(self):
+        cache = self.stored()
+        mtime = os.stat(self.image).st_mtime_ns
+        self.write(b"longer content", mtime_ns=mtime)
+        self.assertIsNone(cache.lookup("E001/1.jpg", self.image, BOX))
+
+    def test_different_face_box_misses(self):
+        self.assertIsNone(self.stored().lookup("E001/1.jpg", self.image, None))
+
+    def test_other_encoder_version_is_discarded(self):
+        self.stored()
+        with open(self.cache_path, "rb") as f:
+            data = pickle.load(f)
+        data["encoder"] = "other"
+        with open(self.cache_path, "wb") as f:
+            pickle.dump(data, f)
+        self.assertEqual(EncodingCache(self.cache_path).entries, {})
+
+    def test_prune_drops_deleted_images(self):
+        cache = self.stored()
+        self.assertEqual(cache.prune({"E002/1.jpg"}), 1)
+        self.assertEqual(cache.entries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
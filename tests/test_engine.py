@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from project.utils import Conf
+from project.utils.engine import RecognitionEngine
+
+BOX = (20, 80, 80, 20)
+
+
+class FixedMatcher:
+    """Names every face the next person in people, at confidence"""
+
+    def __init__(self, people, confidence=0.95):
+        self.people = list(people)
+        self.confidence = confidence
+        self.calls = 0
+
+    def classify(self, encodings):
+        person = self.people[min(self.calls, len(self.people) - 1)]
+        self.calls += 1
+        return np.array([person] * len(encodings)), np.full(len(encodings), self.confidence)
+
+
+class RecognitionEngineTest(unittest.TestCase):
+    def make_engine(self, matcher):
+        engine = RecognitionEngine(Conf("config/config.json"), scale=1.0, zone=[], matcher=matcher)
+        engine.detect_faces = lambda image: [BOX]
+        engine.encode = lambda image, boxes: [np.zeros(128)] * len(boxes)
+        return engine
+
+    def run_passes(self, engine, passes, fps=10.0):
+        """Recognise passes frames of footage at fps; returns [(pass, confirmed person)]"""
+        frame = np.zeros((120, 120, 3), dtype=np.uint8)
+        confirmed = []
+        for n in range(passes):
+            faces, _, classified = engine.recognize(frame, n / fps)
+            confirmed.extend((n, person) for person in engine.confirm(faces, classified))
+        return confirmed
+
+    def test_steady_face_confirms_within_a_few_passes(self):
+        # 3 x 0.95 reaches the shipped early score of 2.7
+        engine = self.make_engine(FixedMatcher(["E001"]))
+        self.assertEqual(self.run_passes(engine, 3), [(2, "E001")])
+
+    def test_confirmed_track_is_only_reverified(self):
+        matcher = FixedMatcher(["E001"])
+        engine = self.make_engine(matcher)
+        self.run_passes(engine, 10)
+        self.assertEqual(matcher.calls, 3)
+
+    def test_reverification_follows_footage_time(self):
+        # Replayed far faster than real time: 6 s of footage still reverifies once
+        matcher = FixedMatcher(["E001"])
+        engine = self.make_engine(matcher)
+        self.run_passes(engine, 60)
+        self.assertEqual(matcher.calls, 4)
+
+    def test_carried_forward_misclassification_does_not_confirm(self):
+        # One wrong match at 0.91, then the right person: the wrong one never wins
+        engine = self.make_engine(FixedMatcher(["E002", "E001"], confidence=0.91))
+        self.assertEqual(self.run_passes(engine, 5), [(3, "E001")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import SVC
+from project.utils.model import CompactSVCMatcher, export_model
+
+
+def fit(n_classes, seed=0):
+    """A linear SVC on clustered 128-d encodings, as train_model.py fits it"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(0, 0.3, (n_classes, 128))
+    encodings = np.concatenate([c + rng.normal(0, 0.08, (12, 128)) for c in centres])
+    names = np.repeat([f"E{i:03d}" for i in range(n_classes)], 12)
+    le = LabelEncoder()
+    labels = le.fit_transform(names)
+    recognizer = SVC(C=1.0, kernel="linear", probability=True, random_state=seed)
+    recognizer.fit(encodings, labels)
+    return recognizer, le, encodings, names, rng
+
+
+class CompactSVCMatcherTest(unittest.TestCase):
+    def check_against_sklearn(self, n_classes):
+        recognizer, le, encodings, names, rng = fit(n_classes)
+        with tempfile.TemporaryDirectory() as model_path:
+            manifest = export_model({"model_path": model_path}, recognizer, le, encodings, names)
+            matcher = CompactSVCMatcher.load(model_path, verify=True)
+            self.assertEqual(matcher.version, manifest["version"])
+
+            queries = np.concatenate([encodings[:5], rng.normal(0, 0.3, (5, 128))])
+            np.testing.assert_allclose(matcher.predict_proba(queries), recognizer.predict_proba(queries),
+                                       atol=1e-9)
+            people, _ = matcher.classify(queries)
+            expected = le.inverse_transform(np.argmax(recognizer.predict_proba(queries), axis=1))
+            self.assertEqual(list(people), list(expected))
+            del matcher  # release the memory-mapped files before the directory goes
+
+    def test_matches_sklearn_two_classes(self):
+        self.check_against_sklearn(2)
+
+    def test_matches_sklearn_many_classes(self):
+        self.check_against_sklearn(5)
+
+    def test_verify_rejects_a_corrupted_file(self):
+        recognizer, le, encodings, names, _ = fit(3)
+        with tempfile.TemporaryDirectory() as model_path:
+            manifest = export_model({"model_path": model_path}, recognizer, le, encodings, names)
+            with open(f"{model_path}/{manifest['directory']}/coef.npy", "r+b") as f:
+                f.seek(-8, 2)
+                f.write(b"\x00" * 8)
+            with self.assertRaises(ValueError):
+                CompactSVCMatcher.load(model_path, verify=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
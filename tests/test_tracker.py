@@ -0,0 +1,64 @@
+import unittest
+from project.utils.tracker import FaceTracker, box_iou
+
+
+class FaceTrackerTest(unittest.TestCase):
+    def test_box_iou(self):
+        self.assertEqual(box_iou((0, 10, 10, 0), (0, 10, 10, 0)), 1.0)
+        self.assertEqual(box_iou((0, 10, 10, 0), (20, 30, 30, 20)), 0.0)
+        self.assertAlmostEqual(box_iou((0, 10, 10, 0), (0, 15, 10, 5)), 50 / 150)
+
+    def test_overlapping_boxes_keep_their_track(self):
+        tracker = FaceTracker()
+        first = tracker.update([(0, 50, 50, 0), (0, 250, 50, 200)], now=0.0)
+        second = tracker.update([(0, 252, 50, 202), (2, 52, 52, 2)], now=0.1)
+        self.assertEqual([t.track_id for t in second], [first[1].track_id, first[0].track_id])
+
+    def test_fast_movement_falls_back_to_the_nearest_centre(self):
+        tracker = FaceTracker(max_centroid_distance=0.5)
+        first = tracker.update([(0, 50, 50, 0)], now=0.0)
+        # Too little overlap, but the centre moved no more than half a face width
+        moved = tracker.update([(10, 65, 40, 35)], now=0.1)
+        self.assertLess(box_iou((0, 50, 50, 0), (10, 65, 40, 35)), tracker.iou_threshold)
+        self.assertEqual(moved[0].track_id, first[0].track_id)
+        far = tracker.update([(0, 400, 50, 350)], now=0.2)
+        self.assertNotEqual(far[0].track_id, first[0].track_id)
+
+    def test_unmatched_tracks_expire_after_max_missed(self):
+        tracker = FaceTracker(max_missed=2)
+        track = tracker.update([(0, 50, 50, 0)], now=0.0)[0]
+        for n in range(2):
+            tracker.update([], now=0.1 * (n + 1))
+        self.assertEqual(tracker.update([(0, 50, 50, 0)], now=0.3)[0].track_id, track.track_id)
+        for n in range(3):
+            tracker.update([], now=0.4 + 0.1 * n)
+        self.assertEqual(tracker.boxes(), [])
+
+    def test_needs_encoding(self):
+        tracker = FaceTracker(min_confidence=0.5, reverify_seconds=5.0, vote_window=3)
+        track = tracker.update([(0, 50, 50, 0)], now=0.0)[0]
+        self.assertTrue(tracker.needs_encoding(track, now=0.0))  # new
+
+        tracker.assign(track, "E001", 0.3, now=0.0)
+        self.assertTrue(tracker.needs_encoding(track, now=0.1))  # low confidence
+
+        tracker.assign(track, "E001", 0.9, now=0.1)
+        self.assertTrue(tracker.needs_encoding(track, now=0.2))  # still being voted on
+
+        tracker.confirm({track.track_id})
+        self.assertFalse(tracker.needs_encoding(track, now=0.2))
+        self.assertTrue(tracker.needs_encoding(track, now=5.1))  # due for reverification
+
+        tracker.assign(track, "E002", 0.9, now=5.1)
+        self.assertTrue(tracker.needs_encoding(track, now=5.2))  # new person, new vote
+
+    def test_unconfirmed_track_stops_after_a_vote_window(self):
+        tracker = FaceTracker(vote_window=3)
+        track = tracker.update([(0, 50, 50, 0)], now=0.0)[0]
+        for n in range(3):
+            tracker.assign(track, "E001", 0.9, now=0.1 * n)
+        self.assertFalse(tracker.needs_encoding(track, now=0.3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from project.utils.voting import TemporalVoter
+
+BOX = (10, 60, 60, 10)
+
+
+class TemporalVoterTest(unittest.TestCase):
+    def test_carried_forward_identity_does_not_vote(self):
+        voter = TemporalVoter(window=10, min_votes=6, early_score=2.7)
+        # One wrong match at 0.91, then the tracker carries it forward for many passes
+        self.assertEqual(voter.update([(BOX, "E002", 0.91, 1)], {1}), [])
+        for _ in range(10):
+            self.assertEqual(voter.update([(BOX, "E002", 0.91, 1)], set()), [])
+
+    def test_repeated_classifications_confirm(self):
+        voter = TemporalVoter(window=10, min_votes=6, early_score=2.7)
+        confirmed = [voter.update([(BOX, "E001", 0.95, 1)], {1}) for _ in range(3)]
+        self.assertEqual(confirmed, [[], [], ["E001"]])
+
+    def test_only_classified_tracks_vote(self):
+        voter = TemporalVoter(window=10, min_votes=3, early_score=0)
+        faces = [(BOX, "E001", 0.95, 1), (BOX, "E002", 0.95, 2)]
+        for _ in range(2):
+            self.assertEqual(voter.update(faces, {1, 2}), [])
+        # Track 2 is carried forward, track 1 is matched again
+        self.assertEqual(voter.update(faces, {1}), ["E001"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from project.utils.watcher import RosterWatcher
+
+
+class RosterWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.db_path = os.path.join(self.dir.name, "enroll.json")
+
+    def write(self, roster):
+        document = {"student": {str(n): {emp_id: [name]} for n, (emp_id, name) in enumerate(roster.items(), 1)}}
+        with open(self.db_path, "w") as f:
+            json.dump(document, f)
+
+    def test_request_applies_only_the_diff(self):
+        roster = {"E001": "Alice", "E002": "Bob"}
+        self.write(roster)
+        watcher = RosterWatcher(self.db_path, roster, interval=0, log=lambda message: None)
+
+        self.write({"E001": "Alice", "E003": "Carol"})
+        watcher.request()  # never started: checks on this thread
+        self.assertEqual(watcher.apply(roster), ["E003"])
+        self.assertEqual(roster, {"E001": "Alice", "E003": "Carol"})
+
+        # Later changes are diffed against what was applied, not the startup roster
+        self.write({"E001": "Alice", "E002": "Bob", "E003": "Carol"})
+        watcher.request()
+        self.assertEqual(watcher.apply(roster), ["E002"])
+        self.assertEqual(roster, {"E001": "Alice", "E002": "Bob", "E003": "Carol"})
+
+    def test_background_thread_picks_up_a_change(self):
+        roster = {"E001": "Alice"}
+        self.write(roster)
+        watcher = RosterWatcher(self.db_path, roster, interval=0, log=lambda message: None).start()
+        self.addCleanup(watcher.stop)
+
+        self.write({"E001": "Alice B."})
+        watcher.request()
+        deadline = time.time() + 2.0
+        while not watcher.apply(roster) and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(roster, {"E001": "Alice B."})
+
+    def test_half_written_file_keeps_the_roster(self):
+        roster = {"E001": "Alice"}
+        self.write(roster)
+        watcher = RosterWatcher(self.db_path, roster, interval=0, log=lambda message: None)
+        with open(self.db_path, "w") as f:
+            f.write('{"student": {"1": {"E0')
+        watcher.request()
+        self.assertEqual(watcher.apply(roster), [])
+        self.assertEqual(roster, {"E001": "Alice"})
+
+
+if __name__ == "__main__":
+    unittest.main()
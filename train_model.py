@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-from project.utils import Conf
+from project.utils import Conf, build_ann_index, export_model
 from sklearn.preprocessing import LabelEncoder
 from sklearn.svm import SVC
 import pickle
@@ -39,6 +39,14 @@ def train_model():
         with open(le_path, "wb") as f:
             pickle.dump(le, f)
 
+        # Build the approximate nearest-neighbour index next to the recognizer
+        print("[INFO] building the ANN index...")
+        build_ann_index(conf, data["encodings"], data["names"])
+
+        # Export the compact model the kiosk loads without sklearn
+        print("[INFO] exporting the compact model...")
+        export_model(conf, recognizer, le, data["encodings"], data["names"])
+
         # Show success message
         messagebox.showinfo("Success", "Model training completed successfully!")
 
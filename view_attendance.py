@@ -1,14 +1,14 @@
 """
 Attendance Viewer - View and export attendance records from SQLite database
 """
-import sqlite3
 from datetime import datetime, timedelta
 import json
 import csv
+from project.utils.database import read_connection
 
 def connect_db():
-    """Connect to the attendance database"""
-    return sqlite3.connect('database/attendance.db')
+    """Pooled read-only connection to the attendance database (close() returns it to the pool)"""
+    return read_connection('database/attendance.db')
 
 def view_today_attendance():
     """View today's attendance"""